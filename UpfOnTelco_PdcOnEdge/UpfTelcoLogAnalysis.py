@@ -9,16 +9,21 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+from matplotlib.patches import Patch, Polygon, Rectangle
+from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection, PolyCollection
 import os
 import sys
 import argparse
 import xml.etree.ElementTree as ET
 import logging
+import traceback
+from dataclasses import dataclass
+import functools
+import gc
 from typing import Dict, List, Tuple, Optional
 import re
 from datetime import datetime
-import csv
 
 # Configuration
 BASE_OUTPUT_DIR = "UpfOnTelco_PdcOnEdge/output"
@@ -28,6 +33,39 @@ SHOW_PLOTS = True
 # Output files
 SIMULATION_MAP_CHART = "edge_simulation_map.png"
 
+# Figure labels of the map and network usage figures, reused across analyzed folders (see dispose_figs)
+MAP_FIGURE = 'simulation_map'
+NETWORK_FIGURE = 'network_usage'
+
+# Columns of the PMU positions table returned by read_pmu_positions_from_csv
+PMU_POSITION_COLUMNS = ['id', 'x', 'y']
+
+# Columns the analysis reads from the state and network CSVs, with their parse dtypes (see _load_csvs)
+_STATE_DTYPES = {'GNBID': 'int32', 'BatchType': 'category', 'ExecTime': 'float32', 'PDCWaitingTime': 'float32',
+                 'TotalTime': 'float32', 'SuccessFlag': 'int8'}
+_NETWORK_DTYPES = {'NetworkLevel': 'string', 'TotalDataVolumeKB': 'float64'}
+CSV_DTYPES = {'state': _STATE_DTYPES, 'network': _NETWORK_DTYPES}
+
+# PMU and link labels are only drawn on the simulation map up to this many PMUs
+MAX_ANNOTATED_PMUS = 30
+
+# Network usage charts: data flow order, labels and colors (network data transfer only, not processing)
+_ORDERED_LEVELS = ('PMU_to_GNB', 'GNB_to_TELCO', 'TELCO_to_GNB')
+_LEVEL_LABELS = {'PMU_to_GNB': 'PMU→GNB', 'GNB_to_TELCO': 'GNB→TELCO', 'TELCO_to_GNB': 'TELCO→GNB'}
+_LEVEL_COLORS = ('blue', 'lightcoral', 'orange')
+_EXTENDED_COLORS = _LEVEL_COLORS + ('gray',)  # Gray for TSO
+_EXTENDED_DARK_COLORS = ('darkblue', 'darkred', 'darkorange', 'darkgreen', 'darkgray')
+_TRANSPORT_LAYERS = {'PMU_to_GNB': 'Cellular', 'GNB_to_TELCO': 'GNBs', 'TELCO_to_GNB': 'GNBs'}
+_LAYER_COLORS = {'Cellular': 'blue', 'GNBs': 'lightcoral', 'TELCO': 'orange', 'TSO': 'gray'}
+_LAYER_CTRL_COLORS = ('darkblue', 'darkred', 'darkorange', 'darkgray')
+
+# Fixed control data size for all layers (constant overhead, KB)
+CONTROL_DATA_SIZE = 2.0  # KB - fixed control overhead per layer
+TSO_CONTROL_SIZE = 0.2   # KB - very small control data for TSO (just for visibility)
+
+# GNB of the first hop of a transfer path ("PMU -> GNB_X (...) -> ..."), compiled once
+_GNB_RE = re.compile(r'^[^>]*->\s*(GNB_\d+)')
+
 def setup_logging(output_folder: str) -> logging.Logger:
     """Setup logging for the analysis."""
     logger = logging.getLogger('PmuSimulationAnalysis')
@@ -126,453 +164,394 @@ def parse_network_links_xml() -> List[Dict[str, any]]:
     
     return links
 
-def read_pmu_positions_from_csv(simulation_folder: str) -> Tuple[List[Dict[str, any]], Dict[str, Dict[str, float]]]:
-    """Read PMU positions from Sequential_simulation_pmu.csv file and calculate hop averages."""
-    pmus = []
-    seen_pmu_ids = set()
+@dataclass(slots=True)
+class HopStats:
+    """Per-PMU hop averages stored column-wise (one array entry per PMU).
+
+    Look a PMU up with ``idx = stats.id_to_idx[pmu_id]`` and index any array with ``idx``.
+    """
+    pmu_id: np.ndarray
+    gnb_time: np.ndarray
+    gnb_count: np.ndarray
+    gnb_distance: np.ndarray
+    gnb_to_telco_time: np.ndarray
+    gnb_to_telco_count: np.ndarray
+    gnb_to_telco_distance: np.ndarray
+    telco_to_tso_time: np.ndarray
+    telco_to_tso_count: np.ndarray
+    telco_to_tso_distance: np.ndarray
+    total_transfers: np.ndarray
+    deadline_missed: np.ndarray
+    deadline_missed_rate: np.ndarray
+    gnb_name: List[str]
+    id_to_idx: Dict[int, int]
+
+    def __len__(self) -> int:
+        return len(self.pmu_id)
+
+    @classmethod
+    def empty(cls) -> 'HopStats':
+        """Return stats for zero PMUs."""
+        no_floats = np.zeros(0)
+        no_ints = np.zeros(0, dtype=np.int64)
+        return cls(
+            pmu_id=no_ints,
+            gnb_time=no_floats, gnb_count=no_ints, gnb_distance=no_floats,
+            gnb_to_telco_time=no_floats, gnb_to_telco_count=no_ints, gnb_to_telco_distance=no_floats,
+            telco_to_tso_time=no_floats, telco_to_tso_count=no_ints, telco_to_tso_distance=no_floats,
+            total_transfers=no_ints, deadline_missed=no_ints, deadline_missed_rate=no_floats,
+            gnb_name=[], id_to_idx={}
+        )
+
+def _bincount_mean(idx: np.ndarray, values: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Average ``values`` per dense index, ignoring NaNs. Returns (means, counts); empty groups average 0.0."""
+    valid = ~np.isnan(values)
+    counts = np.bincount(idx[valid], minlength=n)
+    sums = np.bincount(idx[valid], weights=values[valid], minlength=n)
+    means = np.divide(sums, counts, out=np.zeros(n), where=counts > 0)
+    return means, counts
+
+def _read_transfers_csv(pmu_csv_file: str) -> pd.DataFrame:
+    """Read the PMU transfers CSV with pyarrow's multi-threaded parser, falling back to the python engine.
+    
+    PmuID (the second column) must come back as text so that non-integer IDs can be rejected.
+    pyarrow only converts after inferring a type, so a file whose IDs were not all inferred as
+    integers (e.g. '15.5' turns every ID into '15.0') is re-read as text. Both readers drop rows
+    that do not have one field per header column, as the csv loop did: pyarrow skips them, and
+    the python engine (unlike the C one) leaves the missing fields of a short row NaN rather than
+    blank, so they can be told apart from empty fields and dropped.
+    """
+    try:
+        df = pd.read_csv(pmu_csv_file, engine='pyarrow', dtype_backend='pyarrow', on_bad_lines='skip')
+    except ImportError:  # pyarrow missing
+        df = None
+    except ValueError as e:  # A row it cannot type
+        print(f"⚠️  WARNING: pyarrow could not parse {pmu_csv_file} ({e}), re-reading it as text")
+        df = None
+    if df is not None and len(df.columns) > 1 and pd.api.types.is_integer_dtype(df.iloc[:, 1]):
+        return df.astype({df.columns[1]: 'string'})
+    df = pd.read_csv(pmu_csv_file, engine='python', dtype=str, na_filter=False, on_bad_lines='skip')
+    return df[df.iloc[:, -1].notna()] if len(df.columns) else df
+
+def _index_csvs(folder: str) -> Dict[str, str]:
+    """Map 'network', 'pmu' and 'state' to the simulation CSVs found in ``folder`` (one directory scan)."""
+    suffixes = {
+        '_network_usage.csv': 'network',
+        '_pmu_data_transfers.csv': 'pmu',
+        '_state_estimation.csv': 'state'
+    }
+    csv_paths = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            for suffix, key in suffixes.items():
+                if entry.name.endswith(suffix) and key not in csv_paths:
+                    csv_paths[key] = entry.path
+    return csv_paths
+
+def _typed_columns(path: str, dtypes: Dict[str, str]) -> Dict[str, str]:
+    """The ``dtypes`` entries whose columns appear in the header of ``path``, in file order."""
+    return {column: dtypes[column] for column in pd.read_csv(path, engine='c', nrows=0).columns if column in dtypes}
+
+def _read_typed_csv(path: str, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """Read the ``dtypes`` columns of ``path`` with pyarrow's multi-threaded parser, falling back to the C engine.
+    
+    Columns are parsed straight into their dtype; a file whose values do not fit
+    (e.g. a missing PmuID) is re-read with inferred dtypes.
+    """
+    dtypes = _typed_columns(path, dtypes)
+    columns = list(dtypes)
+    for engine in ('pyarrow', 'c'):
+        try:
+            return pd.read_csv(path, engine=engine, dtype=dtypes, usecols=columns)
+        except ImportError:  # pyarrow missing
+            continue
+        except (ValueError, TypeError) as e:
+            print(f"⚠️  WARNING: {path} does not fit its column dtypes ({e}), re-reading it with inferred dtypes")
+            break
+    return pd.read_csv(path, engine='c', usecols=columns)
+
+def _load_csvs(csv_paths: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+    """Read each indexed simulation CSV once, keeping only the CSV_DTYPES columns it has.
+    
+    See _read_typed_csv for the parsing. A CSV that cannot be read at all is reported
+    and left out; the statistics sections then report it as unparsable.
+    """
+    dfs = {}
+    for key, path in csv_paths.items():
+        try:
+            dfs[key] = _read_typed_csv(path, CSV_DTYPES[key])
+        except Exception as e:
+            print(f"❌ Could not read {path}: {e}")
+    return dfs
+
+@dataclass(slots=True)
+class PmuTransferSummary:
+    """Aggregates of the PMU transfers CSV, built by _summarize_transfer_rows.
+
+    ``per_pmu`` is indexed by sorted PmuID with ok_count, late_count, total_count,
+    avg_transfer_delay and gnb_name columns.
+    """
+    rows: int
+    data_size_count: int
+    data_size_sum: float
+    data_size_m2: float
+    data_size_min: float
+    data_size_max: float
+    per_pmu: pd.DataFrame
+
+    @property
+    def data_size_mean(self) -> float:
+        return self.data_size_sum / self.data_size_count if self.data_size_count else float('nan')
+
+    @property
+    def data_size_std(self) -> float:
+        return float(np.sqrt(self.data_size_m2 / (self.data_size_count - 1))) if self.data_size_count > 1 else float('nan')
+
+def _summarize_transfer_rows(df: pd.DataFrame, numeric: pd.DataFrame, pmu_id_text: pd.Series) -> PmuTransferSummary:
+    """Aggregate every row of the transfers frame read by _load_pmu_transfers, before invalid rows are dropped.
+    
+    ``numeric`` holds the float64 DataSize and HopSum columns (NaN where unparsable), which the
+    aggregates skip; rows whose PmuID is not an integer are left out of ``per_pmu``.
+    """
+    sizes = numeric['DataSize'].dropna()
+    size_mean = sizes.mean()
+    
+    # **Per-PMU counts, mean HopSum and the path of each PMU's first transfer**
+    has_id = pmu_id_text.str.fullmatch(r'[+-]?\d+').fillna(False).to_numpy(dtype=bool)
+    pmu_ids = pmu_id_text[has_id].astype('int64').to_numpy()
+    ids, first_row, idx = np.unique(pmu_ids, return_index=True, return_inverse=True)
+    status = df['Status'][has_id]
+    avg_delay, _ = _bincount_mean(idx, numeric['HopSum'].to_numpy()[has_id], len(ids))
+    per_pmu = pd.DataFrame({
+        'ok_count': np.bincount(idx, weights=(status == 'S').to_numpy(dtype=bool), minlength=len(ids)).astype(np.int64),
+        'late_count': np.bincount(idx, weights=(status == 'L').to_numpy(dtype=bool), minlength=len(ids)).astype(np.int64),
+        'total_count': np.bincount(idx, minlength=len(ids)),
+        'avg_transfer_delay': avg_delay,
+        # GNB name from the first hop of each PMU's first path ("PMU -> GNB_X ...")
+        'gnb_name': df['Path'][has_id].iloc[first_row].astype('string').str.extract(_GNB_RE, expand=False).fillna('GNB_Unknown').to_numpy()
+    }, index=ids)
+    
+    return PmuTransferSummary(rows=len(df), data_size_count=len(sizes), data_size_sum=float(sizes.sum()),
+                              data_size_m2=float(((sizes - size_mean) ** 2).sum()),
+                              data_size_min=float(sizes.min()), data_size_max=float(sizes.max()), per_pmu=per_pmu)
+
+def _summarize_pmu_transfers(pmu_csv_file: str) -> Optional[PmuTransferSummary]:
+    """Aggregates of the PMU transfers CSV, taken from the cached _load_pmu_transfers parse.
     
-    # Dictionary to store hop times for each PMU-GNB connection and calculate averages
-    hop_times = {}  # {pmu_id: {'gnb': times_list, 'gnb_to_telco': times_list, 'telco_to_tso': times_list}}
-    hop_averages = {}  # {pmu_id: {'gnb': avg_time, 'gnb_to_telco': avg_time, 'telco_to_tso': avg_time}}
+    None if the file could not be parsed.
+    """
+    return _load_pmu_transfers(pmu_csv_file, os.path.getmtime(pmu_csv_file), True)[4]
+
+def _is_up_to_date(output_path: str, input_paths: List[str]) -> bool:
+    """True if ``output_path`` exists and is at least as new as every existing input file."""
+    if not os.path.exists(output_path):
+        return False
+    output_mtime = os.path.getmtime(output_path)
+    return all(output_mtime >= os.path.getmtime(path) for path in input_paths if os.path.exists(path))
+
+def read_pmu_positions_from_csv(simulation_folder: str, *, need_hop_stats: bool = True) -> Tuple[pd.DataFrame, HopStats, Dict[int, float], Dict[str, float]]:
+    """Read PMU positions from Sequential_simulation_pmu.csv file and calculate hop averages.
+    
+    Returns (pmus, hop_stats, pmu_to_gnb_avg, gnb_to_telco_avg). pmus has one row per PMU
+    ('id', 'x', 'y') sorted by ID; the last two map PMU IDs and GNB names to their average
+    PMU->GNB and GNB->TELCO transfer times.
+    With need_hop_stats=False only the PMU positions are parsed and the rest is empty.
+    """
+    # **FIXED: Only look for Sequential_simulation_pmu_data_transfers.csv**
+    pmu_csv_file = os.path.join(simulation_folder, "Sequential_simulation_pmu_data_transfers.csv")
+    
+    if not os.path.exists(pmu_csv_file):
+        print(f"ERROR: Sequential_simulation_pmu_data_transfers.csv not found at: {pmu_csv_file}")
+        print("Available files in simulation folder:")
+        try:
+            for file in os.listdir(simulation_folder):
+                print(f"  - {file}")
+        except Exception as e:
+            print(f"Could not list directory: {e}")
+        return pd.DataFrame(columns=PMU_POSITION_COLUMNS), HopStats.empty(), {}, {}
+    
+    print(f"✓ Found PMU CSV file: {pmu_csv_file}")
+    
+    # **Keyed on mtime so a rewritten CSV is parsed again**
+    return _load_pmu_transfers(pmu_csv_file, os.path.getmtime(pmu_csv_file), need_hop_stats)[:4]
+
+@functools.lru_cache(maxsize=8)
+def _load_pmu_transfers(pmu_csv_file: str, mtime: float, need_hop_stats: bool) -> Tuple[pd.DataFrame, HopStats, Dict[int, float], Dict[str, float], Optional[PmuTransferSummary]]:
+    """Parse the PMU transfers CSV; see read_pmu_positions_from_csv.
     
-    # **NEW: Track DEADLINE_MISSED data per PMU**
-    deadline_missed_stats = {}  # {pmu_id: {'total_transfers': count, 'deadline_missed': count}}
+    The fifth element is the PmuTransferSummary of the same parse: None if it failed, and not
+    computed with need_hop_stats=False.
     
+    Results are cached per (file, mtime, need_hop_stats) for the life of the process and
+    shared between callers, so they must be treated as read-only.
+    """
+    summary = None
     try:
-        # **FIXED: Only look for Sequential_simulation_pmu_data_transfers.csv**
-        pmu_csv_file = os.path.join(simulation_folder, "Sequential_simulation_pmu_data_transfers.csv")
-        
-        if not os.path.exists(pmu_csv_file):
-            print(f"ERROR: Sequential_simulation_pmu_data_transfers.csv not found at: {pmu_csv_file}")
-            print("Available files in simulation folder:")
-            try:
-                for file in os.listdir(simulation_folder):
-                    print(f"  - {file}")
-            except Exception as e:
-                print(f"Could not list directory: {e}")
-            return [], {}
-        
-        print(f"✓ Found PMU CSV file: {pmu_csv_file}")
-        
-        # **FIXED: Read CSV with proper CSV parsing using csv module**
-        print("📖 Loading CSV file with proper CSV parsing...")
-        
-        # **Read the CSV file using csv module**
-        with open(pmu_csv_file, 'r') as file:
-            csv_reader = csv.reader(file)
-            
-            # Read header
-            header = next(csv_reader)
-            print(f"✓ CSV header: {header}")
-            
-            # **Verify we have the expected 7 columns**
-            if len(header) != 7:
-                print(f"❌ ERROR: Expected 7 columns in header, got {len(header)}")
-                return [], {}
-            
-            # **Debug: Track status values**
-            status_counts = {}
-            debug_entries = 0
-            
-            expected_columns = ['Time', 'PmuID', 'PmuCoordinates', 'DataSize', 'Path', 'HopSum', 'Status']
-            for i, col in enumerate(expected_columns):
-                if i < len(header) and header[i] != col:
-                    print(f"⚠️  WARNING: Expected column '{col}' at position {i}, got '{header[i]}'")
-            
-            # **Process data rows**
-            processed_entries = 0
-            processed_pmus = 0
-            
-            for line_num, row in enumerate(csv_reader, start=2):  # Start from line 2 (after header)
-                try:
-                    # **Ensure we have exactly 7 columns**
-                    if len(row) != 7:
-                        print(f"❌ Skipping line {line_num}: Got {len(row)} columns, need exactly 7")
-                        continue
-                    
-                    # **Extract all 7 fields**
-                    time_val = float(row[0])
-                    pmu_id = int(row[1])
-                    pmu_coordinates = row[2].strip('"')  # Remove quotes if present
-                    data_size = float(row[3])
-                    path = row[4].strip('"')  # Remove quotes if present  
-                    hop_sum = float(row[5])
-                    status = row[6].strip()  # Status column (OK or DEADLINE_MISSED)
-                    
-                    # **Check for DEADLINE_MISSED in the Status column ('L' = Deadline Missed, 'S' = Success)**
-                    deadline_missed = (status == 'L')
-                    
-                    # **Debug: Track status values for first few entries**
-                    debug_entries += 1
-                    if status not in status_counts:
-                        status_counts[status] = 0
-                    status_counts[status] += 1
-                    
-                    if debug_entries <= 10:
-                        print(f"🔍 Entry {debug_entries}: Status = '{status}', deadline_missed = {deadline_missed}")
-                    
-                    processed_entries += 1
-                    
-                    # **Track deadline missed statistics per PMU**
-                    if pmu_id not in deadline_missed_stats:
-                        deadline_missed_stats[pmu_id] = {'total_transfers': 0, 'deadline_missed': 0}
-                    
-                    deadline_missed_stats[pmu_id]['total_transfers'] += 1
-                    if deadline_missed:
-                        deadline_missed_stats[pmu_id]['deadline_missed'] += 1
-                    
-                    # **Parse Path to extract GNB and hop times WITH DISTANCES**
-                    if '->' in path:
-                        # Parse NEW format: "PMU -> GNB_1 (0.0060s, 42.9m) -> TELCO (0.0114s, 500.0m) -> TSO (0.0606s, 1415.6m)"
-                        path_parts = path.split(' -> ')
-                        
-                        gnb_name = None
-                        pmu_to_gnb_time = None
-                        pmu_to_gnb_distance = None
-                        gnb_to_telco_time = None
-                        gnb_to_telco_distance = None
-                        telco_to_tso_time = None
-                        telco_to_tso_distance = None
-                        
-                        # **Extract GNB name, PMU->GNB time and distance**
-                        if len(path_parts) >= 2:
-                            gnb_part = path_parts[1].strip()  # "GNB_1 (0.0060s, 42.9m)"
-                            # Updated regex to capture both time and distance
-                            gnb_match = re.match(r'(GNB_\d+|GNB_Unknown)\s*\(([\d.]+)s,\s*([\d.]+)m\)', gnb_part)
-                            if gnb_match:
-                                gnb_name = gnb_match.group(1)
-                                pmu_to_gnb_time = float(gnb_match.group(2))
-                                pmu_to_gnb_distance = float(gnb_match.group(3))
-                        
-                        # **Extract GNB->TELCO time and distance**
-                        if len(path_parts) >= 3:
-                            telco_part = path_parts[2].strip()  # "TELCO (0.0114s, 500.0m)"
-                            telco_match = re.search(r'\(([\d.]+)s,\s*([\d.]+)m\)', telco_part)
-                            if telco_match:
-                                gnb_to_telco_time = float(telco_match.group(1))
-                                gnb_to_telco_distance = float(telco_match.group(2))
-                        
-                        # **Extract TELCO->TSO time and distance**
-                        if len(path_parts) >= 4:
-                            tso_part = path_parts[3].strip()  # "TSO (0.0606s, 1415.6m)"
-                            tso_match = re.search(r'\(([\d.]+)s,\s*([\d.]+)m\)', tso_part)
-                            if tso_match:
-                                telco_to_tso_time = float(tso_match.group(1))
-                                telco_to_tso_distance = float(tso_match.group(2))
-                        
-                        # **Store hop times and distances for averaging**
-                        if pmu_id not in hop_times:
-                            hop_times[pmu_id] = {
-                                'gnb_times': [], 'gnb_to_telco_times': [], 'telco_to_tso_times': [],
-                                'gnb_distances': [], 'gnb_to_telco_distances': [], 'telco_to_tso_distances': [],
-                                'gnb_name': gnb_name
-                            }
-                        
-                        if pmu_to_gnb_time is not None:
-                            hop_times[pmu_id]['gnb_times'].append(pmu_to_gnb_time)
-                        if pmu_to_gnb_distance is not None:
-                            hop_times[pmu_id]['gnb_distances'].append(pmu_to_gnb_distance)
-                        if gnb_to_telco_time is not None:
-                            hop_times[pmu_id]['gnb_to_telco_times'].append(gnb_to_telco_time)
-                        if gnb_to_telco_distance is not None:
-                            hop_times[pmu_id]['gnb_to_telco_distances'].append(gnb_to_telco_distance)
-                        if telco_to_tso_time is not None:
-                            hop_times[pmu_id]['telco_to_tso_times'].append(telco_to_tso_time)
-                        if telco_to_tso_distance is not None:
-                            hop_times[pmu_id]['telco_to_tso_distances'].append(telco_to_tso_distance)
-                        if gnb_name:
-                            hop_times[pmu_id]['gnb_name'] = gnb_name
-                    
-                    # **If we haven't seen this PMU ID before, store its position**
-                    if pmu_id not in seen_pmu_ids:
-                        # **Parse coordinates from string format "(x,y)"**
-                        if processed_pmus < 5:
-                            print(f"🎯 Processing PMU {pmu_id}: coords_str = '{pmu_coordinates}', status = '{status}', deadline_missed = {deadline_missed}")
-                        
-                        # **Parse coordinates from string format "(x,y)"**
-                        if pmu_coordinates.startswith('(') and pmu_coordinates.endswith(')'):
-                            coords_clean = pmu_coordinates[1:-1]  # Remove parentheses
-                            try:
-                                if ',' in coords_clean:
-                                    x_str, y_str = coords_clean.split(',', 1)  # Split on first comma only
-                                    pmu_x = float(x_str.strip())
-                                    pmu_y = float(y_str.strip())
-                                    
-                                    # **Store this PMU with the actual PMU ID from PmuID**
-                                    pmus.append({
-                                        'id': pmu_id,
-                                        'x': pmu_x,
-                                        'y': pmu_y
-                                    })
-                                    seen_pmu_ids.add(pmu_id)
-                                    processed_pmus += 1
-                                    
-                                    if processed_pmus <= 5:  # Show first 5 PMUs for debugging
-                                        print(f"✅ PMU {pmu_id} at position ({pmu_x:.1f}, {pmu_y:.1f})")
-                                else:
-                                    if processed_pmus < 5:
-                                        print(f"❌ No comma found in coords: '{coords_clean}'")
-                            except ValueError as e:
-                                if processed_pmus < 5:
-                                    print(f"❌ Error parsing coordinates '{pmu_coordinates}' for PMU {pmu_id}: {e}")
-                        else:
-                            if processed_pmus < 5:
-                                print(f"❌ Invalid coordinate format '{pmu_coordinates}' for PMU {pmu_id}")
-                    
-                except (ValueError, IndexError) as e:
-                    if processed_entries <= 5:
-                        print(f"❌ Error processing line {line_num}: {e}")
-                    continue
-                
-                # Continue processing all entries in the CSV file for accurate statistics
-            
-            print(f"✅ Processed {processed_entries} entries: {processed_pmus} unique PMUs found")
-            
-            # **Debug: Print status value counts**
-            print(f"📊 Status value counts: {status_counts}")
-            total_deadline_missed = status_counts.get('L', 0)
-            total_success = status_counts.get('S', 0)
-            print(f"📈 Total deadline missed (L): {total_deadline_missed}, Total success (S): {total_success}")
-            
-            # **Store deadline missed stats in hop_averages for later use**
-            global_deadline_missed_stats = deadline_missed_stats
-            
+        print("📖 Loading CSV file...")
+        df = _read_transfers_csv(pmu_csv_file)
+        
+        header = list(df.columns)
+        print(f"✓ CSV header: {header}")
+        
+        # **Verify we have the expected 7 columns**
+        if len(header) != 7:
+            print(f"❌ ERROR: Expected 7 columns in header, got {len(header)}")
+            return pd.DataFrame(columns=PMU_POSITION_COLUMNS), HopStats.empty(), {}, {}, summary
+        
+        expected_columns = ['Time', 'PmuID', 'PmuCoordinates', 'DataSize', 'Path', 'HopSum', 'Status']
+        for i, col in enumerate(expected_columns):
+            if header[i] != col:
+                print(f"⚠️  WARNING: Expected column '{col}' at position {i}, got '{header[i]}'")
+        df.columns = expected_columns  # Columns are positional, as in the simulator output
+        
+        # **Blank text fields are empty strings, as the csv module read them**
+        # (an all-blank column is read untyped, so it is replaced outright; others keep their Arrow string type)
+        for column in ('PmuCoordinates', 'Path', 'Status'):
+            df[column] = df[column].fillna('') if df[column].notna().any() else ''
+        
+        # **Keep only rows whose numeric fields parse and whose PmuID is an integer**
+        # (cast to float64: on Arrow-backed text, to_numeric marks unparsable values NaN, which notna() keeps;
+        # built column by column because DataFrame.apply skips the function on a header-only frame)
+        numeric = pd.DataFrame({column: pd.to_numeric(df[column], errors='coerce').astype('float64')
+                                for column in ('Time', 'DataSize', 'HopSum')})
+        pmu_id_text = df['PmuID'].astype('string').str.strip()
+        summary = _summarize_transfer_rows(df, numeric, pmu_id_text) if need_hop_stats else None
+        valid = (numeric.notna().all(axis=1) & pmu_id_text.str.fullmatch(r'[+-]?\d+').fillna(False)).to_numpy(dtype=bool)
+        df = df[valid]
+        
+        if df.empty:
+            print("✅ Processed 0 entries: 0 unique PMUs found")
+            return pd.DataFrame(columns=PMU_POSITION_COLUMNS), HopStats.empty(), {}, {}, summary
+        
+        pmu_ids = pmu_id_text[valid].astype('int64').to_numpy()
+        
+        # **PMU positions: first parsable "(x,y)" per PMU, in order of appearance**
+        coords = df['PmuCoordinates'].str.strip('"').str.extract(r'^\((?P<x>[^,]*),(?P<y>.*)\)$')
+        positions = pd.DataFrame({
+            'id': pmu_ids,
+            'x': pd.to_numeric(coords['x'].str.strip(), errors='coerce').to_numpy(),
+            'y': pd.to_numeric(coords['y'].str.strip(), errors='coerce').to_numpy()
+        }).dropna().drop_duplicates('id')
+        pmus = positions.sort_values('id', kind='stable').reset_index(drop=True)
+        
+        print(f"✅ Processed {len(df)} entries: {len(pmus)} unique PMUs found")
+        
+        if not need_hop_stats:
+            return pmus, HopStats.empty(), {}, {}, summary
+        
+        # **Status column ('L' = Deadline Missed, 'S' = Success)**
+        status = df['Status'].str.strip()
+        deadline_missed = (status == 'L').to_numpy()
+        status_counts = status.value_counts(sort=False).to_dict()
+        print(f"📊 Status value counts: {status_counts}")
+        print(f"📈 Total deadline missed (L): {status_counts.get('L', 0)}, Total success (S): {status_counts.get('S', 0)}")
+        
+        # **Parse Path to extract GNB and hop times WITH DISTANCES**
+        # Format: "PMU -> GNB_1 (0.0060s, 42.9m) -> TELCO (0.0114s, 500.0m) -> GNB_1 (0.0606s, 500.0m)"
+        paths = df['Path'].str.strip('"')
+        has_hops = paths.str.contains('->', regex=False).to_numpy(dtype=bool)
+        hops = paths.str.split(' -> ', expand=True).reindex(columns=range(4), fill_value='')  # Missing hops match nothing
+        gnb_hop = hops[1].str.strip().str.extract(r'^(?P<name>GNB_\d+|GNB_Unknown)\s*\((?P<time>[\d.]+)s,\s*(?P<distance>[\d.]+)m\)')
+        telco_hop = hops[2].str.strip().str.extract(r'\((?P<time>[\d.]+)s,\s*(?P<distance>[\d.]+)m\)')
+        tso_hop = hops[3].str.strip().str.extract(r'\((?P<time>[\d.]+)s,\s*(?P<distance>[\d.]+)m\)')
+    
     except Exception as e:
         print(f"❌ Error in read_pmu_positions_from_csv: {e}")
-        import traceback
         traceback.print_exc()
-        return [], {}
+        return pd.DataFrame(columns=PMU_POSITION_COLUMNS), HopStats.empty(), {}, {}, summary
     
-    # **Calculate averages for each PMU**
+    # **Calculate averages for each PMU that has hop information**
     print("📊 Calculating hop time and distance averages...")
-    for pmu_id, times_data in hop_times.items():
-        hop_averages[pmu_id] = {}
-        
-        # **Calculate average PMU->GNB time and distance**
-        if times_data['gnb_times']:
-            hop_averages[pmu_id]['gnb'] = sum(times_data['gnb_times']) / len(times_data['gnb_times'])
-            hop_averages[pmu_id]['gnb_count'] = len(times_data['gnb_times'])
-        else:
-            hop_averages[pmu_id]['gnb'] = 0.0
-            hop_averages[pmu_id]['gnb_count'] = 0
-        
-        if times_data['gnb_distances']:
-            hop_averages[pmu_id]['gnb_distance'] = sum(times_data['gnb_distances']) / len(times_data['gnb_distances'])
-        else:
-            hop_averages[pmu_id]['gnb_distance'] = 0.0
-        
-        # **Calculate average GNB->TELCO time and distance**
-        if times_data['gnb_to_telco_times']:
-            hop_averages[pmu_id]['gnb_to_telco'] = sum(times_data['gnb_to_telco_times']) / len(times_data['gnb_to_telco_times'])
-            hop_averages[pmu_id]['gnb_to_telco_count'] = len(times_data['gnb_to_telco_times'])
-        else:
-            hop_averages[pmu_id]['gnb_to_telco'] = 0.0
-            hop_averages[pmu_id]['gnb_to_telco_count'] = 0
-        
-        if times_data['gnb_to_telco_distances']:
-            hop_averages[pmu_id]['gnb_to_telco_distance'] = sum(times_data['gnb_to_telco_distances']) / len(times_data['gnb_to_telco_distances'])
-        else:
-            hop_averages[pmu_id]['gnb_to_telco_distance'] = 0.0
-        
-        # **Calculate average TELCO->TSO time and distance**  
-        if times_data['telco_to_tso_times']:
-            hop_averages[pmu_id]['telco_to_tso'] = sum(times_data['telco_to_tso_times']) / len(times_data['telco_to_tso_times'])
-            hop_averages[pmu_id]['telco_to_tso_count'] = len(times_data['telco_to_tso_times'])
-        else:
-            hop_averages[pmu_id]['telco_to_tso'] = 0.0
-            hop_averages[pmu_id]['telco_to_tso_count'] = 0
-        
-        if times_data['telco_to_tso_distances']:
-            hop_averages[pmu_id]['telco_to_tso_distance'] = sum(times_data['telco_to_tso_distances']) / len(times_data['telco_to_tso_distances'])
-        else:
-            hop_averages[pmu_id]['telco_to_tso_distance'] = 0.0
-        
-        # **Store GNB name**
-        hop_averages[pmu_id]['gnb_name'] = times_data.get('gnb_name', 'GNB_Unknown')
-        
-        # **Store deadline missed stats for this PMU**
-        if pmu_id in deadline_missed_stats:
-            hop_averages[pmu_id]['total_transfers'] = deadline_missed_stats[pmu_id]['total_transfers']
-            hop_averages[pmu_id]['deadline_missed'] = deadline_missed_stats[pmu_id]['deadline_missed']
-            hop_averages[pmu_id]['deadline_missed_rate'] = (deadline_missed_stats[pmu_id]['deadline_missed'] / deadline_missed_stats[pmu_id]['total_transfers']) * 100 if deadline_missed_stats[pmu_id]['total_transfers'] > 0 else 0
-        else:
-            hop_averages[pmu_id]['total_transfers'] = 0
-            hop_averages[pmu_id]['deadline_missed'] = 0
-            hop_averages[pmu_id]['deadline_missed_rate'] = 0
-        
-        if pmu_id <= 5:  # Show first 5 PMUs for debugging
-            print(f"📈 PMU {pmu_id} -> {hop_averages[pmu_id]['gnb_name']}: avg {hop_averages[pmu_id]['gnb']:.4f}s ({hop_averages[pmu_id]['gnb_distance']:.1f}m), {hop_averages[pmu_id]['deadline_missed']} missed deadlines")
-    
-    print(f"🎯 Final Results: {len(pmus)} unique PMUs found, {len(hop_averages)} PMUs with hop averages")
+    hop_ids, hop_idx = np.unique(pmu_ids[has_hops], return_inverse=True)
+    n = len(hop_ids)
+    
+    # Columns: PMU->GNB time/distance, GNB->TELCO time/distance, TELCO->TSO time/distance
+    hop_values = pd.concat([gnb_hop[['time', 'distance']], telco_hop, tso_hop], axis=1)
+    hop_values = hop_values.apply(lambda column: pd.to_numeric(column, errors='coerce').astype('float64')).to_numpy()[has_hops]
+    
+    gnb_time, gnb_count = _bincount_mean(hop_idx, hop_values[:, 0], n)
+    gnb_distance, _ = _bincount_mean(hop_idx, hop_values[:, 1], n)
+    gnb_to_telco_time, gnb_to_telco_count = _bincount_mean(hop_idx, hop_values[:, 2], n)
+    gnb_to_telco_distance, _ = _bincount_mean(hop_idx, hop_values[:, 3], n)
+    telco_to_tso_time, telco_to_tso_count = _bincount_mean(hop_idx, hop_values[:, 4], n)
+    telco_to_tso_distance, _ = _bincount_mean(hop_idx, hop_values[:, 5], n)
+    
+    # **Deadline missed stats count every transfer of the PMU, with or without hop information**
+    row_idx = np.searchsorted(hop_ids, pmu_ids)
+    in_hops = row_idx < n
+    in_hops[in_hops] = hop_ids[row_idx[in_hops]] == pmu_ids[in_hops]
+    total_transfers = np.bincount(row_idx[in_hops], minlength=n)
+    missed = np.bincount(row_idx[in_hops], weights=deadline_missed[in_hops], minlength=n).astype(np.int64)
+    missed_rate = np.divide(missed * 100.0, total_transfers, out=np.zeros(n), where=total_transfers > 0)
+    
+    # **GNB name: last one seen in the PMU's paths**
+    hop_gnb = gnb_hop['name'].to_numpy(dtype=object, na_value=None)[has_hops]
+    last_gnb = pd.Series(hop_gnb).groupby(hop_idx).last()
+    gnb_names = last_gnb.reindex(range(n)).fillna('GNB_Unknown').tolist()
+    
+    hop_stats = HopStats(
+        pmu_id=hop_ids,
+        gnb_time=gnb_time, gnb_count=gnb_count, gnb_distance=gnb_distance,
+        gnb_to_telco_time=gnb_to_telco_time, gnb_to_telco_count=gnb_to_telco_count,
+        gnb_to_telco_distance=gnb_to_telco_distance,
+        telco_to_tso_time=telco_to_tso_time, telco_to_tso_count=telco_to_tso_count,
+        telco_to_tso_distance=telco_to_tso_distance,
+        total_transfers=total_transfers, deadline_missed=missed, deadline_missed_rate=missed_rate,
+        gnb_name=gnb_names,
+        id_to_idx={int(pmu_id): idx for idx, pmu_id in enumerate(hop_ids)}
+    )
+    
+    # **Average PMU->GNB time per PMU and GNB->TELCO time per GNB**
+    pmu_to_gnb_avg = {int(pmu_id): float(t) for pmu_id, t, count in zip(hop_ids, gnb_time, gnb_count) if count > 0}
+    gnb_to_telco_avg = pd.DataFrame({'GNB': hop_gnb, 't': hop_values[:, 2]}).dropna()
+    gnb_to_telco_avg = gnb_to_telco_avg[gnb_to_telco_avg['GNB'] != 'GNB_Unknown'].groupby('GNB')['t'].mean().to_dict()
+    print(f"✅ Calculated average GNB-to-TELCO times for {len(gnb_to_telco_avg)} GNBs")
+    
+    for idx in np.flatnonzero(hop_ids <= 5):  # Show first 5 PMUs for debugging
+        print(f"📈 PMU {hop_ids[idx]} -> {gnb_names[idx]}: avg {gnb_time[idx]:.4f}s ({gnb_distance[idx]:.1f}m), {missed[idx]} missed deadlines")
+    
+    print(f"🎯 Final Results: {len(pmus)} unique PMUs found, {len(hop_stats)} PMUs with hop averages")
     
     # **DEBUG: Show a few PMU positions to verify they are valid**
-    if pmus:
+    if not pmus.empty:
         print("📍 Sample PMU positions:")
-        for i, pmu in enumerate(pmus[:5]):
-            print(f"  PMU {pmu['id']}: ({pmu['x']:.1f}, {pmu['y']:.1f})")
+        for pmu in pmus.head(5).itertuples(index=False):
+            print(f"  PMU {pmu.id}: ({pmu.x:.1f}, {pmu.y:.1f})")
     
-    return sorted(pmus, key=lambda x: x['id']), hop_averages
+    return pmus, hop_stats, pmu_to_gnb_avg, gnb_to_telco_avg, summary
 
-def calculate_pmu_to_gnb_average_times(simulation_folder: str) -> Dict[int, float]:
-    """Calculate average PMU to GNB transfer times from Sequential_simulation_pmu.csv."""
-    pmu_to_gnb_times = {}  # {pmu_id: [list of times]}
+def create_simulation_map(simulation_folder: str, logger: logging.Logger, force: bool = False):
+    """Create the PMU simulation map showing GNBs, PMUs, TELCO and connections.
     
-    try:
-        pmu_csv_file = os.path.join(simulation_folder, "Sequential_simulation_pmu_data_transfers.csv")
-        
-        if not os.path.exists(pmu_csv_file):
-            print(f"WARNING: Sequential_simulation_pmu_data_transfers.csv not found for PMU-GNB time calculation")
-            return {}
-        
-        print("📊 Calculating PMU to GNB average transfer times...")
-        
-        with open(pmu_csv_file, 'r') as file:
-            csv_reader = csv.reader(file)
-            
-            # Skip header
-            next(csv_reader)
-            
-            for line_num, row in enumerate(csv_reader, start=2):
-                try:
-                    if len(row) != 7:
-                        continue
-                    
-                    pmu_id = int(row[1])
-                    path = row[4].strip('"')  # Path column
-                    
-                    # Extract PMU to GNB time from path
-                    # Format: "PMU -> GNB_1 (0.0060s, 42.9m) -> TELCO (0.0114s, 500.0m) -> TSO (0.0606s, 1415.6m)"
-                    if '->' in path:
-                        path_parts = path.split(' -> ')
-                        
-                        if len(path_parts) >= 2:
-                            gnb_part = path_parts[1].strip()  # "GNB_1 (0.0060s, 42.9m)"
-                            # Extract time from first parenthesis
-                            import re
-                            time_match = re.search(r'\(([\d.]+)s,', gnb_part)
-                            if time_match:
-                                pmu_to_gnb_time = float(time_match.group(1))
-                                
-                                if pmu_id not in pmu_to_gnb_times:
-                                    pmu_to_gnb_times[pmu_id] = []
-                                
-                                pmu_to_gnb_times[pmu_id].append(pmu_to_gnb_time)
-                
-                except (ValueError, IndexError) as e:
-                    continue
-                
-                # Continue processing all entries for accurate statistics
-        
-        # Calculate averages
-        pmu_averages = {}
-        for pmu_id, times in pmu_to_gnb_times.items():
-            if times:
-                avg_time = sum(times) / len(times)
-                pmu_averages[pmu_id] = avg_time
-                if pmu_id <= 5:  # Debug first 5 PMUs
-                    print(f"  PMU {pmu_id}: {len(times)} samples, avg time to GNB: {avg_time:.4f}s")
-        
-        print(f"✅ Calculated average PMU-to-GNB times for {len(pmu_averages)} PMUs")
-        return pmu_averages
-        
-    except Exception as e:
-        print(f"❌ Error calculating PMU to GNB times: {e}")
-        return {}
-
-def calculate_gnb_to_telco_average_times(simulation_folder: str) -> Dict[str, float]:
-    """Calculate average GNB to TELCO transfer times from Sequential_simulation_pmu_data_transfers.csv."""
-    gnb_to_telco_times = {}  # {gnb_name: [list of times]}
-    
-    try:
-        pmu_csv_file = os.path.join(simulation_folder, "Sequential_simulation_pmu_data_transfers.csv")
-        
-        if not os.path.exists(pmu_csv_file):
-            print(f"WARNING: Sequential_simulation_pmu_data_transfers.csv not found for GNB-TELCO time calculation")
-            return {}
-        
-        print("📊 Calculating GNB to TELCO average transfer times...")
-        
-        with open(pmu_csv_file, 'r') as file:
-            csv_reader = csv.reader(file)
-            
-            # Skip header
-            next(csv_reader)
-            
-            for line_num, row in enumerate(csv_reader, start=2):
-                try:
-                    if len(row) != 7:
-                        continue
-                    
-                    path = row[4].strip('"')  # Path column
-                    
-                    # Extract GNB to TELCO time from path
-                    # Format: "PMU -> GNB_6 (0.0000s, 419.6m) -> TELCO (0.0131s, 707.1m) -> GNB_6 (0.0113s, 707.1m)"
-                    if '->' in path:
-                        path_parts = path.split(' -> ')
-                        
-                        # Extract GNB name from first hop
-                        gnb_name = None
-                        if len(path_parts) >= 2:
-                            gnb_part = path_parts[1].strip()  # "GNB_6 (0.0000s, 419.6m)"
-                            import re
-                            gnb_match = re.match(r'(GNB_\d+)', gnb_part)
-                            if gnb_match:
-                                gnb_name = gnb_match.group(1)
-                        
-                        # Extract TELCO time from second hop
-                        if len(path_parts) >= 3 and gnb_name:
-                            telco_part = path_parts[2].strip()  # "TELCO (0.0131s, 707.1m)"
-                            telco_match = re.search(r'\(([\d.]+)s,', telco_part)
-                            if telco_match:
-                                gnb_to_telco_time = float(telco_match.group(1))
-                                
-                                if gnb_name not in gnb_to_telco_times:
-                                    gnb_to_telco_times[gnb_name] = []
-                                
-                                gnb_to_telco_times[gnb_name].append(gnb_to_telco_time)
-                
-                except (ValueError, IndexError) as e:
-                    continue
-                
-                # Continue processing all entries for accurate statistics
-        
-        # Calculate averages
-        gnb_averages = {}
-        for gnb_name, times in gnb_to_telco_times.items():
-            if times:
-                avg_time = sum(times) / len(times)
-                gnb_averages[gnb_name] = avg_time
-                print(f"  {gnb_name}: {len(times)} samples, avg time to TELCO: {avg_time:.4f}s")
-        
-        print(f"✅ Calculated average GNB-to-TELCO times for {len(gnb_averages)} GNBs")
-        return gnb_averages
-        
-    except Exception as e:
-        print(f"❌ Error calculating GNB to TELCO times: {e}")
-        return {}
-
-def create_simulation_map(simulation_folder: str, logger: logging.Logger):
-    """Create the PMU simulation map showing GNBs, PMUs, TELCO and connections."""
+    The map is not redrawn if it is newer than the PMU CSV and the settings files, unless force is set.
+    """
     if not SHOW_PLOTS:
         return
     
+    output_path = os.path.join(simulation_folder, SIMULATION_MAP_CHART)
+    map_inputs = [
+        os.path.join(simulation_folder, "Sequential_simulation_pmu_data_transfers.csv"),
+        os.path.join(PMU_SETTINGS_DIR, "simulation_parameters.properties"),
+        os.path.join(PMU_SETTINGS_DIR, "edge_datacenters.xml")
+    ]
+    if not force and _is_up_to_date(output_path, map_inputs):
+        logger.info(f"PMU simulation map is up to date, skipping: {output_path}")
+        return
+    
     logger.info("Creating PMU simulation map...")
     
     # Read configuration data
     params = read_simulation_parameters()
     datacenters = parse_edge_datacenters_xml()
     links = parse_network_links_xml()
-    pmus, hop_averages = read_pmu_positions_from_csv(simulation_folder)
-    
-    # **NEW: Get GNB to TELCO average latency times**
-    gnb_to_telco_times = calculate_gnb_to_telco_average_times(simulation_folder)
+    pmus, hop_stats, _, gnb_to_telco_times = read_pmu_positions_from_csv(simulation_folder)
     
     # Get PMU count for map title
     max_pmus = params['max_edge_devices']
     
     # Create the plot
-    plt.figure(figsize=(16, 16))
-    ax = plt.gca()
+    fig = plt.figure(num=MAP_FIGURE, figsize=(16, 16), clear=True)
+    ax = fig.gca()
     
     # Constants for visualization
     COVERAGE_RADIUS = params['edge_datacenters_coverage']
@@ -618,7 +597,6 @@ def create_simulation_map(simulation_folder: str, logger: logging.Logger):
     datacenter_positions['TELCO'] = (telco_x, telco_y)
     
     # Create hexagon for TELCO (same style as CloudLogAnalysis.py)
-    from matplotlib.patches import Polygon
     hexagon = Polygon([
         (telco_x - TELCO_SIZE, telco_y),
         (telco_x - TELCO_SIZE/2, telco_y + TELCO_SIZE*0.866),
@@ -645,43 +623,40 @@ def create_simulation_map(simulation_folder: str, logger: logging.Logger):
             gnb_to_edge_mapping[gnb_name] = (datacenter['x'], datacenter['y'])
     
     # Plot PMUs as squares and connect to their assigned GNB (not EDGE)
-    for pmu in pmus:
-        x, y = pmu['x'], pmu['y']
-        pmu_id = pmu['id']
-        
-        # Plot PMU as a square
-        pmu_square = plt.Rectangle((x - PMU_SIZE/2, y - PMU_SIZE/2), PMU_SIZE, PMU_SIZE,
-                                 color='green', alpha=0.8, ec='darkgreen', linewidth=2)
-        ax.add_patch(pmu_square)
-        
-        # Add PMU label
-        plt.annotate(f'PMU_{pmu_id}', (x, y), xytext=(15, 15), textcoords='offset points',
-                   fontsize=10, fontweight='bold', color='darkgreen',
-                   bbox=dict(boxstyle="round,pad=0.2", facecolor='lightgreen', alpha=0.7))
-        
-        # **Connect PMU to its assigned GNB with dashed lines and average times + distances**
-        if pmu_id in hop_averages:
-            gnb_name = hop_averages[pmu_id]['gnb_name']
-            avg_time = hop_averages[pmu_id]['gnb']
-            avg_distance = hop_averages[pmu_id]['gnb_distance']
-            sample_count = hop_averages[pmu_id]['gnb_count']
-            
-            if gnb_name in gnb_to_edge_mapping:
-                gnb_x, gnb_y = gnb_to_edge_mapping[gnb_name]
-                
-                # Draw dashed connection line between PMU and GNB
-                plt.plot([x, gnb_x], [y, gnb_y], 'gray', linestyle='--', 
-                        linewidth=2, alpha=0.7)
-                
-                # **Add average time and distance label on the connection**
-                mid_x = (x + gnb_x) / 2
-                mid_y = (y + gnb_y) / 2
-                plt.annotate(f'{avg_time:.3f}s\n{avg_distance:.0f}m', 
-                           (mid_x, mid_y), 
-                           xytext=(0, 5), textcoords='offset points',
-                           fontsize=7, fontweight='bold', color='blue',
-                           ha='center', va='bottom',
-                           bbox=dict(boxstyle="round,pad=0.1", facecolor='lightblue', alpha=0.7))
+    xs = pmus['x'].to_numpy(dtype=float)
+    ys = pmus['y'].to_numpy(dtype=float)
+    pmu_ids = pmus['id'].to_numpy()
+    
+    # **One collection for all PMU squares, PMU_SIZE meters wide in data units**
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) * (PMU_SIZE / 2)
+    squares = np.stack([xs, ys], axis=1)[:, None, :] + corners
+    ax.add_collection(PolyCollection(squares, facecolors='green', edgecolors='darkgreen',
+                                     linewidths=2, alpha=0.8, rasterized=True))
+    
+    # **Connect PMUs to their assigned GNB with dashed lines and average times + distances**
+    idx = np.array([hop_stats.id_to_idx.get(int(pmu_id), -1) for pmu_id in pmu_ids], dtype=np.int64)
+    gnb_names = [hop_stats.gnb_name[i] if i >= 0 else None for i in idx]
+    gnb_xy = np.array([gnb_to_edge_mapping.get(name, (np.nan, np.nan)) for name in gnb_names], dtype=float).reshape(-1, 2)
+    linked = ~np.isnan(gnb_xy[:, 0])
+    segments = np.stack([np.stack([xs, ys], axis=1), gnb_xy], axis=1)[linked]
+    ax.add_collection(LineCollection(segments, colors='gray', linestyles='--', linewidths=2,
+                                     alpha=0.7, zorder=2, rasterized=True))  # Same layer as plt.plot lines
+    
+    # **Text labels are one artist each, so they are skipped on crowded maps**
+    if len(pmus) <= MAX_ANNOTATED_PMUS:
+        for x, y, pmu_id in zip(xs, ys, pmu_ids):
+            plt.annotate(f'PMU_{pmu_id}', (x, y), xytext=(15, 15), textcoords='offset points',
+                       fontsize=10, fontweight='bold', color='darkgreen',
+                       bbox=dict(boxstyle="round,pad=0.2", facecolor='lightgreen', alpha=0.7))
+        
+        midpoints = 0.5 * (segments[:, 0] + segments[:, 1])
+        for (mid_x, mid_y), i in zip(midpoints, idx[linked]):
+            plt.annotate(f'{hop_stats.gnb_time[i]:.3f}s\n{hop_stats.gnb_distance[i]:.0f}m', 
+                       (mid_x, mid_y), 
+                       xytext=(0, 5), textcoords='offset points',
+                       fontsize=7, fontweight='bold', color='blue',
+                       ha='center', va='bottom',
+                       bbox=dict(boxstyle="round,pad=0.1", facecolor='lightblue', alpha=0.7))
     
     # **NEW: Add connections from all GNB datacenters to TELCO with latency labels**
     for datacenter in datacenters:
@@ -719,12 +694,12 @@ def create_simulation_map(simulation_folder: str, logger: logging.Logger):
     
     # Create legend (same style as CloudLogAnalysis.py)
     legend_elements = [
-        plt.Rectangle((0, 0), 1, 1, color='green', alpha=0.8, label='PMU Sensors'),
-        plt.Circle((0, 0), 1, color='gray', alpha=0.8, label='Edge Datacenters (GNBs)'),
-        plt.Polygon([(0, 0), (0.5, 0.866), (1, 0), (0.5, -0.866)], color='lightcoral', alpha=0.9, label='TELCO Hub'),
-        plt.Line2D([0], [0], color='purple', linewidth=3, alpha=0.7, label='Network Links'),
-        plt.Line2D([0], [0], color='gray', linestyle='--', alpha=0.5, label='PMU-EDGE Links'),
-        plt.Circle((0, 0), 1, color='gray', alpha=0.15, label='Coverage Area')
+        Patch(color='green', alpha=0.8, label='PMU Sensors'),
+        Patch(color='gray', alpha=0.8, label='Edge Datacenters (GNBs)'),
+        Patch(color='lightcoral', alpha=0.9, label='TELCO Hub'),
+        Line2D([], [], color='purple', linewidth=3, alpha=0.7, label='Network Links'),
+        Line2D([], [], color='gray', linestyle='--', alpha=0.5, label='PMU-EDGE Links'),
+        Patch(color='gray', alpha=0.15, label='Coverage Area')
     ]
     
     plt.legend(handles=legend_elements, loc='upper right', fontsize=10)
@@ -736,15 +711,26 @@ def create_simulation_map(simulation_folder: str, logger: logging.Logger):
     plt.ylim(-margin, params['width'] + margin)  # No extra space needed
     
     # Save the plot
-    output_path = os.path.join(simulation_folder, SIMULATION_MAP_CHART)
     plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    
+    # **Release the figure's artists right away (the figure itself is kept for the next folder)**
+    fig.clear()
+    if len(pmus) > MAX_ANNOTATED_PMUS:
+        gc.collect()
     
     logger.info(f"PMU simulation map saved at: {output_path}")
     print(f"PMU simulation map created: {output_path}")
 
-def analyze_pmu_simulation(output_folder: str):
-    """Main analysis function for PMU simulation data."""
+def dispose_figs():
+    """Close the map and network usage figures kept between analyzed folders."""
+    for num in (MAP_FIGURE, NETWORK_FIGURE):
+        plt.close(num)
+
+def analyze_pmu_simulation(output_folder: str, force: bool = False):
+    """Main analysis function for PMU simulation data.
+    
+    With force=False, charts that are newer than their inputs are not redrawn.
+    """
     simulation_folder = os.path.join(BASE_OUTPUT_DIR, output_folder)
     
     # Setup logging
@@ -754,17 +740,24 @@ def analyze_pmu_simulation(output_folder: str):
     logger.info(f"Analyzing simulation data in folder: {output_folder}")
     
     try:
+        # **Locate the simulation CSVs once for all the analysis steps**
+        csv_paths = _index_csvs(simulation_folder)
+        dfs = _load_csvs({key: path for key, path in csv_paths.items() if key in CSV_DTYPES})
+        
+        # **The PMU transfers CSV is parsed once, by the cached loader the map and hop statistics share**
+        pmu_summary = _summarize_pmu_transfers(csv_paths['pmu']) if 'pmu' in csv_paths else None
+        
         # Create the simulation map
-        create_simulation_map(simulation_folder, logger)
+        create_simulation_map(simulation_folder, logger, force=force)
         
         # **Generate single comprehensive statistics file**
-        generate_comprehensive_statistics(simulation_folder, logger)
+        generate_comprehensive_statistics(simulation_folder, csv_paths, dfs, pmu_summary, logger)
         
         # **NEW: Export statistics to CSV format**
-        export_statistics_to_csv(simulation_folder, logger)
+        export_statistics_to_csv(simulation_folder, csv_paths, dfs, pmu_summary, logger)
         
         # **NEW: Generate network bandwidth usage charts**
-        generate_network_usage_charts(simulation_folder, logger)
+        generate_network_usage_charts(simulation_folder, csv_paths, dfs, logger, force=force)
         
         logger.info("=== PMU Analysis Complete ===")
         
@@ -772,36 +765,32 @@ def analyze_pmu_simulation(output_folder: str):
         logger.error(f"Error during PMU analysis: {str(e)}")
         raise
 
-def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger):
-    """Generate network bandwidth usage charts from network usage CSV."""
+def generate_network_usage_charts(simulation_folder: str, csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame], logger: logging.Logger, force: bool = False):
+    """Generate network bandwidth usage charts from network usage CSV.
+    
+    The charts are not redrawn if they are newer than the network usage CSV, unless force is set.
+    """
     logger.info("Generating network bandwidth usage charts...")
     
     try:
-        # Look for network usage CSV file
-        network_csv = None
-        for file in os.listdir(simulation_folder):
-            if file.endswith("_network_usage.csv") or file == "Sequential_simulation_network_usage.csv":
-                network_csv = os.path.join(simulation_folder, file)
-                break
+        # Network usage data, read once in analyze_pmu_simulation
+        df_network = dfs.get('network')
         
-        if not network_csv or not os.path.exists(network_csv):
+        if df_network is None:
             print("⚠️  Network usage CSV not found - skipping network charts")
             return
         
-        print(f"📊 Found network usage CSV: {network_csv}")
+        chart_file = os.path.join(simulation_folder, "network_usage_analysis.png")
+        if not force and _is_up_to_date(chart_file, [csv_paths['network']]):
+            logger.info(f"Network usage charts are up to date, skipping: {chart_file}")
+            return chart_file
         
-        # Read network usage data
-        import pandas as pd
-        df_network = pd.read_csv(network_csv)
+        print(f"📊 Found network usage CSV: {csv_paths['network']}")
         
         # Create network usage charts
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12), num=NETWORK_FIGURE, clear=True)
         fig.suptitle('Network Bandwidth Usage Analysis', fontsize=16, fontweight='bold')
         
-        # Define order of data flow and colors (only network data transfer, not processing)
-        ordered_levels = ['PMU_to_GNB', 'GNB_to_TELCO', 'TELCO_to_GNB']
-        level_colors = ['blue', 'lightcoral', 'orange']
-        
         # Chart 1: Data Flow Sequence with Control Data (top left)
         if not df_network.empty:
             # Get data in proper order + TSO (only control data)
@@ -809,25 +798,17 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
             control_data = []  # Control data for each layer
             labels = []
             
-            # Fixed control data size for all layers (constant overhead)
-            CONTROL_DATA_SIZE = 2.0  # KB - fixed control overhead per layer
-            TSO_CONTROL_SIZE = 0.2   # KB - very small control data for TSO (just for visibility)
+            # First recorded volume of each network level, read with single-cell .at lookups
+            first_volumes = df_network.drop_duplicates('NetworkLevel').set_index('NetworkLevel')['TotalDataVolumeKB']
             
-            for level in ordered_levels:
-                if level in df_network['NetworkLevel'].values:
-                    volume = df_network[df_network['NetworkLevel'] == level]['TotalDataVolumeKB'].iloc[0]
+            for level in _ORDERED_LEVELS:
+                if level in first_volumes.index:
+                    volume = first_volumes.at[level]
                     ordered_volumes.append(volume)
                     control_data.append(CONTROL_DATA_SIZE)  # Fixed control data for all layers
                     
                     # Create readable labels
-                    if level == 'PMU_to_GNB':
-                        labels.append('PMU→GNB')
-                    elif level == 'GNB_to_TELCO':
-                        labels.append('GNB→TELCO')
-                    elif level == 'TELCO_to_GNB':
-                        labels.append('TELCO→GNB')
-                    else:
-                        labels.append(level.replace('_', ' '))
+                    labels.append(_LEVEL_LABELS.get(level, level.replace('_', ' ')))
                 else:
                     ordered_volumes.append(0)
                     control_data.append(0)
@@ -838,13 +819,10 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
             control_data.append(TSO_CONTROL_SIZE)   # Very small control data for TSO
             labels.append('TSO Control')
             
-            # Create stacked bars with control data (add gray for TSO)
-            extended_colors = level_colors + ['gray']  # Add gray for TSO
-            extended_dark_colors = ['darkblue', 'darkred', 'darkorange', 'darkgreen', 'darkgray']
-            
-            bars1_main = ax1.bar(labels, ordered_volumes, color=extended_colors[:len(labels)], label='Main Data')
+            # Create stacked bars with control data (gray for TSO)
+            bars1_main = ax1.bar(labels, ordered_volumes, color=list(_EXTENDED_COLORS[:len(labels)]), label='Main Data')
             bars1_control = ax1.bar(labels, control_data, bottom=ordered_volumes, 
-                                  color=extended_dark_colors[:len(labels)], 
+                                  color=list(_EXTENDED_DARK_COLORS[:len(labels)]), 
                                   label='Control Data', alpha=0.8)
             
             ax1.set_title('Data Flow Sequence (PMU→GNB→TELCO→GNB→Analysis)', fontweight='bold')
@@ -876,31 +854,25 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
         }
         
         if not df_network.empty:
-            for _, row in df_network.iterrows():
-                level = row['NetworkLevel']
-                volume = row['TotalDataVolumeKB']
-                
-                # **FILTER: Only include network transport data, not processing data**
-                if level.startswith('StateEstimation_'):
-                    continue  # Skip processing data from infrastructure calculations
-                
-                if level == 'PMU_to_GNB':
-                    layer_data['Cellular'] += volume
-                elif level in ['GNB_to_TELCO', 'TELCO_to_GNB']:
-                    layer_data['GNBs'] += volume
-                    # **FIXED: TELCO network also handles the same data that passes through it**
-                    layer_data['TELCO'] += volume
-                # TSO gets no data - nothing goes there directly
+            # **FILTER: Only include network transport data, not processing data**
+            transport = df_network[~df_network['NetworkLevel'].str.startswith('StateEstimation_')]
+            
+            layer = transport['NetworkLevel'].map(_TRANSPORT_LAYERS)
+            layer_sums = transport['TotalDataVolumeKB'].groupby(layer).sum()  # Unmapped levels are dropped
+            layer_data['Cellular'] += layer_sums.get('Cellular', 0)
+            layer_data['GNBs'] += layer_sums.get('GNBs', 0)
+            # **FIXED: TELCO network also handles the same data that passes through it**
+            layer_data['TELCO'] += layer_sums.get('GNBs', 0)
+            # TSO gets no data - nothing goes there directly
         
         layer_names = list(layer_data.keys())
         layer_volumes = list(layer_data.values())
         layer_ctrl_volumes = list(layer_control.values())
-        layer_colors_infra = ['blue', 'lightcoral', 'orange', 'gray']
-        layer_ctrl_colors = ['darkblue', 'darkred', 'darkorange', 'darkgray']
+        layer_colors_infra = [_LAYER_COLORS[layer] for layer in layer_names]
         
         bars2_main = ax2.bar(layer_names, layer_volumes, color=layer_colors_infra, label='Data Traffic')
         bars2_control = ax2.bar(layer_names, layer_ctrl_volumes, bottom=layer_volumes, 
-                              color=layer_ctrl_colors, label='Control Data', alpha=0.8)
+                              color=list(_LAYER_CTRL_COLORS), label='Control Data', alpha=0.8)
         
         ax2.set_title('Network Infrastructure Data Distribution', fontweight='bold')
         ax2.set_xlabel('Network Layer')
@@ -917,26 +889,20 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
         
         # Chart 3: GNB Data Volume Distribution (bottom left)
         if not df_network.empty:
-            # Extract GNB data volumes from CSV
-            gnb_names = []
-            gnb_volumes = []
-            
             # Find all GNB entries in the CSV
-            for _, row in df_network.iterrows():
-                level = row['NetworkLevel']
-                if level.startswith('GNB_'):
-                    gnb_names.append(level)
-                    gnb_volumes.append(row['TotalDataVolumeKB'])
+            levels = df_network['NetworkLevel'].to_numpy(dtype=str)
+            is_gnb = np.char.startswith(levels, 'GNB_')
+            gnb_levels = levels[is_gnb]
+            gnb_level_volumes = df_network['TotalDataVolumeKB'].to_numpy()[is_gnb]
+            
+            # Sort by GNB number for consistent ordering (non-numeric entries such as GNB_to_TELCO last)
+            gnb_number = np.char.partition(np.char.partition(gnb_levels, '_')[..., 2], '_')[..., 0]
+            keys = np.where(np.char.isdigit(gnb_number), gnb_number, '999').astype(np.int64)
+            order = np.argsort(keys, kind='stable')
+            gnb_names = gnb_levels[order].tolist()
+            gnb_volumes = gnb_level_volumes[order].tolist()
             
-            # Sort by GNB number for consistent ordering
             if gnb_names and gnb_volumes:
-                # Extract GNB numbers for sorting
-                gnb_data = list(zip(gnb_names, gnb_volumes))
-                gnb_data.sort(key=lambda x: int(x[0].split('_')[1]) if x[0].split('_')[1].isdigit() else 999)
-                gnb_names, gnb_volumes = zip(*gnb_data)
-                gnb_names = list(gnb_names)
-                gnb_volumes = list(gnb_volumes)
-                
                 # Create color scheme for GNBs (different shades of blue/green)
                 gnb_colors = plt.cm.Set3(np.linspace(0, 1, len(gnb_names)))
                 
@@ -978,16 +944,14 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
                 if total_volume > 0.1:  # Filter very small values
                     pie_labels.append(layer)
                     pie_sizes.append(total_volume)
-                    if layer == 'Cellular':
-                        pie_colors.append('blue')
-                    elif layer == 'GNBs':
-                        pie_colors.append('lightcoral')
-                    elif layer == 'TELCO':
-                        pie_colors.append('orange')
-                    elif layer == 'TSO':
-                        pie_colors.append('gray')
+                    pie_colors.append(_LAYER_COLORS[layer])
             
-            if pie_sizes:
+            if len(pie_sizes) < 2:
+                # A pie needs at least two wedges to show a distribution - skip the wedge tessellation
+                ax4.text(0.5, 0.5, 'Insufficient Traffic Data', ha='center', va='center', 
+                        transform=ax4.transAxes, fontsize=12, color='gray')
+                ax4.set_title('Network Infrastructure Usage Distribution', fontweight='bold')
+            else:
                 wedges, texts, autotexts = ax4.pie(pie_sizes, labels=pie_labels, colors=pie_colors, 
                                                  autopct='%1.1f%%', startangle=90)
                 ax4.set_title('Network Infrastructure Usage Distribution', fontweight='bold')
@@ -1002,9 +966,8 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
         plt.subplots_adjust(top=0.93)  # Make room for suptitle
         
         # Save the chart
-        chart_file = os.path.join(simulation_folder, "network_usage_analysis.png")
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-        plt.close()
+        plt.savefig(chart_file, dpi=150, bbox_inches='tight')  # Bar/pie charts stay legible at 150 DPI
+        fig.clear()
         
         print(f"📊 Network usage charts saved to: {chart_file}")
         logger.info(f"Network usage charts saved to: {chart_file}")
@@ -1016,73 +979,41 @@ def generate_network_usage_charts(simulation_folder: str, logger: logging.Logger
         logger.error(f"Error creating network usage charts: {e}")
         return None
 
-def generate_comprehensive_statistics(simulation_folder: str, logger: logging.Logger):
-    """Generate comprehensive statistics file combining PMU data and Grid Analysis analysis."""
-    logger.info("Generating Comprehensive Statistics...")
-    
-    # **Read PMU count from simulation parameters**
-    params = read_simulation_parameters()
-    max_pmus = params['max_edge_devices']
-    
-    # Import pandas at the start
-    import pandas as pd
-    
-    comprehensive_report = f"""
-=== PMU SMART GRID SIMULATION STATISTICS ===
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Simulation Folder: {os.path.basename(simulation_folder)}
-
-PMU CONFIGURATION:
-- Total PMUs: {max_pmus}
-- Simulation Area: {params['length']}m x {params['width']}m
-- Edge Coverage: {params['edge_datacenters_coverage']}m
-
-"""
-    
-    # **SECTION 1: PMU Data Transfer Analysis**
-    pmu_csv = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_pmu_data_transfers.csv") or file == "Sequential_simulation_pmu_data_transfers.csv":
-            pmu_csv = os.path.join(simulation_folder, file)
-            break
+def _pmu_transfer_section(simulation_folder: str, csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame], pmu_summary: Optional[PmuTransferSummary]) -> str:
+    """Comprehensive statistics section 1: PMU data transfer analysis."""
+    report_parts: List[str] = []
     
     # **Get hop averages for additional analysis**
     try:
-        _, hop_averages = read_pmu_positions_from_csv(simulation_folder)
+        _, hop_stats, _, _ = read_pmu_positions_from_csv(simulation_folder)
     except Exception as e:
-        hop_averages = {}
+        hop_stats = HopStats.empty()
         print(f"Could not get hop averages: {e}")
     
-    # **NEW: Get PMU to GNB average times**
-    pmu_to_gnb_avg_times = calculate_pmu_to_gnb_average_times(simulation_folder)
-    
-    if pmu_csv and os.path.exists(pmu_csv):
+    if pmu_summary is not None:
         try:
-            import pandas as pd
-            df = pd.read_csv(pmu_csv)
-            
-            total_transfers = len(df)
-            unique_pmus = df['PmuID'].nunique()
+            total_transfers = pmu_summary.rows
+            unique_pmus = len(pmu_summary.per_pmu)
             
             # Data size statistics
-            avg_data_size = df['DataSize'].mean()
-            min_data_size = df['DataSize'].min()
-            max_data_size = df['DataSize'].max()
-            std_data_size = df['DataSize'].std()
-            total_data_volume = df['DataSize'].sum()
+            avg_data_size = pmu_summary.data_size_mean
+            min_data_size = pmu_summary.data_size_min
+            max_data_size = pmu_summary.data_size_max
+            std_data_size = pmu_summary.data_size_std
+            total_data_volume = pmu_summary.data_size_sum
             
             # **Add hop averages statistics if available - DISTRIBUTED ARCHITECTURE**
-            hop_stats = ""
-            if hop_averages:
+            hop_delay_report = ""
+            if hop_stats:
                 # Only PMU->GNB hop exists in distributed architecture
-                pmu_to_gnb_times = [avg['gnb'] for avg in hop_averages.values() if avg['gnb'] > 0]
-                pmu_to_gnb_distances = [avg['gnb_distance'] for avg in hop_averages.values() if avg['gnb_distance'] > 0]
+                pmu_to_gnb_times = hop_stats.gnb_time[hop_stats.gnb_time > 0]
+                pmu_to_gnb_distances = hop_stats.gnb_distance[hop_stats.gnb_distance > 0]
                 
-                if pmu_to_gnb_times:
-                    avg_pmu_to_gnb = sum(pmu_to_gnb_times) / len(pmu_to_gnb_times)
-                    avg_pmu_to_gnb_dist = sum(pmu_to_gnb_distances) / len(pmu_to_gnb_distances) if pmu_to_gnb_distances else 0
+                if pmu_to_gnb_times.size:
+                    avg_pmu_to_gnb = pmu_to_gnb_times.mean()
+                    avg_pmu_to_gnb_dist = pmu_to_gnb_distances.mean() if pmu_to_gnb_distances.size else 0
                     
-                    hop_stats = f"""
+                    hop_delay_report = f"""
 AVERAGE HOP DELAY AND DISTANCE (PMU → GNB):
 - Average Hop Delay: {avg_pmu_to_gnb:.4f}s
 - Average Distance: {avg_pmu_to_gnb_dist:.1f}m
@@ -1091,122 +1022,76 @@ AVERAGE HOP DELAY AND DISTANCE (PMU → GNB):
             
             # **NEW: Generate detailed DATA TASKS DEADLINE MISSED statistics per PMU**
             deadline_missed_details = ""
-            if hop_averages:
+            if hop_stats:
                 # Calculate overall deadline missed statistics
-                total_deadline_missed = sum(avg.get('deadline_missed', 0) for avg in hop_averages.values())
-                total_all_transfers = sum(avg.get('total_transfers', 0) for avg in hop_averages.values())
+                total_deadline_missed = int(hop_stats.deadline_missed.sum())
+                total_all_transfers = int(hop_stats.total_transfers.sum())
                 overall_deadline_missed_rate = (total_deadline_missed / total_all_transfers) * 100 if total_all_transfers > 0 else 0
                 
                 # Count PMUs with deadline misses
-                pmus_with_misses = len([avg for avg in hop_averages.values() if avg.get('deadline_missed', 0) > 0])
+                pmus_with_misses = int(np.count_nonzero(hop_stats.deadline_missed))
                 
-                deadline_missed_details = f"""
+                # **Collect the report lines as fragments and join them once at the end**
+                details_parts = [f"""
 PMU DATA MISSED DEADLINE SUMMARY:
 - PMU Data that Missed Deadline: {total_deadline_missed}/{total_all_transfers} ({overall_deadline_missed_rate:.2f}%)
 
-DETAILED TRANSFERS PER PMU:"""
+DETAILED TRANSFERS PER PMU:"""]
                 
                 # **Read PDC Waiting Times and Total Times from state estimation CSV**
                 gnb_pdc_waiting_times = {}
                 gnb_total_times = {}
-                state_csv = None
-                for file in os.listdir(simulation_folder):
-                    if file.endswith("_state_estimation.csv") or file == "Sequential_simulation_state_estimation.csv":
-                        state_csv = os.path.join(simulation_folder, file)
-                        break
+                df_state = dfs.get('state')
                 
-                if state_csv and os.path.exists(state_csv):
-                    import pandas as pd
-                    df_state = pd.read_csv(state_csv)
-                    
-                    # Group by GNBID and calculate average PDCWaitingTime and TotalTime
-                    for gnb_id in df_state['GNBID'].unique():
-                        gnb_rows = df_state[df_state['GNBID'] == gnb_id]
-                        avg_pdc_waiting = gnb_rows['PDCWaitingTime'].mean() if 'PDCWaitingTime' in gnb_rows.columns else 0.0
-                        avg_total_time = gnb_rows['TotalTime'].mean() if 'TotalTime' in gnb_rows.columns else 0.0
-                        gnb_name = f"GNB_{gnb_id}"
-                        gnb_pdc_waiting_times[gnb_name] = avg_pdc_waiting
-                        gnb_total_times[gnb_name] = avg_total_time
+                if df_state is not None:
+                    # Average PDCWaitingTime and TotalTime per GNBID in one groupby pass (a missing column averages 0.0)
+                    state_columns = ['PDCWaitingTime', 'TotalTime']
+                    state_means = df_state.groupby('GNBID')[[c for c in state_columns if c in df_state.columns]].mean()
+                    state_means = state_means.reindex(columns=state_columns, fill_value=0.0)
+                    gnb_pdc_waiting_times = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['PDCWaitingTime'].items()}
+                    gnb_total_times = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['TotalTime'].items()}
                 
-                # **Calculate average transfer delay per PMU from HopSum**
-                pmu_avg_transfer_delay = {}
+                # **Accurate OK vs total counts per PMU from the loader's PmuTransferSummary**
+                pmu_stats_from_csv = pmu_summary.per_pmu
                 
-                # **Re-analyze CSV to get accurate OK vs total counts per PMU and per GNB**
-                pmu_stats_from_csv = {}
-                gnb_stats_from_csv = {}
+                # Accumulate stats per GNB
+                gnb_stats_from_csv = pmu_stats_from_csv.groupby('gnb_name').agg(
+                    ok_count=('ok_count', 'sum'),
+                    total_count=('total_count', 'sum'),
+                    pmu_count=('ok_count', 'size')
+                )
                 
-                if pmu_csv and os.path.exists(pmu_csv):
-                    import pandas as pd
-                    df_detailed = pd.read_csv(pmu_csv)
-                    
-                    # Group by PMU ID to get stats per PMU
-                    for pmu_id in df_detailed['PmuID'].unique():
-                        pmu_rows = df_detailed[df_detailed['PmuID'] == pmu_id]
-                        total_transfers = len(pmu_rows)
-                        ok_transfers = len(pmu_rows[pmu_rows['Status'] == 'S'])
-                        deadline_missed_transfers = len(pmu_rows[pmu_rows['Status'] == 'L'])
-                        
-
-                        
-                        # Extract GNB name from path (assuming format "PMU -> GNB_X ...")
-                        gnb_name = 'GNB_Unknown'
-                        if not pmu_rows.empty and 'Path' in pmu_rows.columns:
-                            sample_path = pmu_rows.iloc[0]['Path']
-                            if ' -> ' in sample_path:
-                                parts = sample_path.split(' -> ')
-                                if len(parts) >= 2:
-                                    gnb_part = parts[1].strip()
-                                    import re
-                                    gnb_match = re.match(r'(GNB_\d+)', gnb_part)
-                                    if gnb_match:
-                                        gnb_name = gnb_match.group(1)
-                        
-                        pmu_stats_from_csv[pmu_id] = {
-                            'ok_count': ok_transfers,
-                            'total_count': total_transfers,
-                            'gnb_name': gnb_name
-                        }
-                        
-                        # **Calculate average transfer delay for this PMU from HopSum**
-                        avg_hop_sum = pmu_rows['HopSum'].mean() if 'HopSum' in pmu_rows.columns else 0.0
-                        pmu_avg_transfer_delay[pmu_id] = avg_hop_sum
-                        
-                        # Accumulate stats per GNB
-                        if gnb_name not in gnb_stats_from_csv:
-                            gnb_stats_from_csv[gnb_name] = {'ok_count': 0, 'total_count': 0, 'pmu_count': 0}
-                        gnb_stats_from_csv[gnb_name]['ok_count'] += ok_transfers
-                        gnb_stats_from_csv[gnb_name]['total_count'] += total_transfers
-                        gnb_stats_from_csv[gnb_name]['pmu_count'] += 1
+                # **Display ALL PMUs with correct OK/total counts, formatted column by column**
+                ok_counts = pmu_stats_from_csv['ok_count']
+                total_counts = pmu_stats_from_csv['total_count']
+                success_rates = (ok_counts / total_counts * 100).where(total_counts > 0, 0)
                 
-                # **Display ALL PMUs with correct OK/total counts**
-                for pmu_id in sorted(pmu_stats_from_csv.keys()):
-                    stats = pmu_stats_from_csv[pmu_id]
-                    ok_count = stats['ok_count']
-                    total_count = stats['total_count']
-                    gnb_name = stats['gnb_name']
-                    success_rate = (ok_count / total_count) * 100 if total_count > 0 else 0
-                    avg_transfer_delay = pmu_avg_transfer_delay.get(pmu_id, 0.0)
-                    
-                    # Show successful transfers for all PMUs with average transfer delay
-                    deadline_missed_details += f"""
-  PMU_{pmu_id:02d} → {gnb_name}: {ok_count}/{total_count} transfers on time ({success_rate:.1f}%) - avg transfer delay: {avg_transfer_delay:.4f}s"""
+                # Show successful transfers for all PMUs with average transfer delay
+                # (an empty table is skipped: map() on no rows keeps the float dtype, which cannot be concatenated)
+                if not pmu_stats_from_csv.empty:
+                    details_parts.extend(
+                        "\n  PMU_" + pmu_stats_from_csv.index.to_series().astype(str).str.zfill(2)
+                        + " → " + pmu_stats_from_csv['gnb_name']
+                        + ": " + ok_counts.astype(str) + "/" + total_counts.astype(str)
+                        + " transfers on time (" + success_rates.map('{:.1f}'.format)
+                        + "%) - avg transfer delay: " + pmu_stats_from_csv['avg_transfer_delay'].map('{:.4f}'.format) + "s"
+                    )
                 
                 # **Add summary by GNB using CSV data**
-                if gnb_stats_from_csv:
-                    deadline_missed_details += f"""
-
-GNB SUMMARY LOGS:"""
-                    for gnb, stats in sorted(gnb_stats_from_csv.items()):
-                        ok_count = stats['ok_count']
-                        total_count = stats['total_count']
-                        pmu_count = stats['pmu_count']
+                if not gnb_stats_from_csv.empty:
+                    details_parts.append(f"""
+
+GNB SUMMARY LOGS:""")
+                    for gnb, ok_count, total_count, pmu_count in gnb_stats_from_csv.itertuples(name=None):
                         avg_pdc_waiting_time = gnb_pdc_waiting_times.get(gnb, 0.0)
                         avg_gnb_total_time = gnb_total_times.get(gnb, 0.0)
                         success_rate = (ok_count / total_count) * 100 if total_count > 0 else 0
-                        deadline_missed_details += f"""
-  {gnb}: {ok_count}/{total_count} transfers on time ({success_rate:.1f}%) from {pmu_count} PMUs - avg PDC waiting time: {avg_pdc_waiting_time:.4f}s - avg TotalTime: {avg_gnb_total_time:.4f}s"""
+                        details_parts.append(f"""
+  {gnb}: {ok_count}/{total_count} transfers on time ({success_rate:.1f}%) from {pmu_count} PMUs - avg PDC waiting time: {avg_pdc_waiting_time:.4f}s - avg TotalTime: {avg_gnb_total_time:.4f}s""")
+                
+                deadline_missed_details = "".join(details_parts)
             
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === PMU DATA TRANSFER STATISTICS ===
 
 DATA SIZE STATISTICS:
@@ -1215,62 +1100,61 @@ DATA SIZE STATISTICS:
 - Maximum Data Size: {max_data_size:.2f} KB
 - Standard Deviation: {std_data_size:.2f} KB
 - Total Data Volume: {total_data_volume:.2f} KB
-{hop_stats}
+{hop_delay_report}
 {deadline_missed_details}
-"""
+""")
         except Exception as e:
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === PMU DATA TRANSFER STATISTICS ===
 ERROR: Could not analyze PMU data transfers: {str(e)}
 
-"""
+""")
+    elif 'pmu' in csv_paths:
+        report_parts.append(f"""
+=== PMU DATA TRANSFER STATISTICS ===
+ERROR: Could not parse PMU Data CSV file: {csv_paths['pmu']}
+
+""")
     else:
-        comprehensive_report += f"""
+        report_parts.append(f"""
 === PMU DATA TRANSFER STATISTICS ===
 WARNING: PMU Data CSV file not found
 
-"""
+""")
     
-    # **SECTION 2: Grid Analysis**
-    state_csv = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_state_estimation.csv") or file == "Sequential_simulation_state_estimation.csv":
-            state_csv = os.path.join(simulation_folder, file)
-            break
+    return "".join(report_parts)
+
+def _grid_analysis_section(csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame]) -> str:
+    """Comprehensive statistics section 2: Grid Analysis task statistics."""
+    report_parts: List[str] = []
+    
+    df = dfs.get('state')
     
-    if state_csv and os.path.exists(state_csv):
+    if df is not None:
         try:
-            import pandas as pd
-            df = pd.read_csv(state_csv)
-            
             total_tasks = len(df)
-            successful_tasks = len(df[df['SuccessFlag'] == 1])
-            failed_tasks = len(df[df['SuccessFlag'] == 0])
+            successful_df = df[df['SuccessFlag'] == 1]
+            successful_tasks = len(successful_df)
+            failed_tasks = int((df['SuccessFlag'] == 0).sum())
             success_rate = (successful_tasks / total_tasks) * 100 if total_tasks > 0 else 0
             
             # Execution time statistics (only for successful tasks)
-            successful_df = df[df['SuccessFlag'] == 1]
             if len(successful_df) > 0:
-                avg_exec_time = successful_df['ExecTime'].mean()
-                min_exec_time = successful_df['ExecTime'].min()
-                max_exec_time = successful_df['ExecTime'].max()
-                std_exec_time = successful_df['ExecTime'].std()
+                avg_exec_time, min_exec_time, max_exec_time, std_exec_time = successful_df['ExecTime'].agg(['mean', 'min', 'max', 'std'])
             else:
                 avg_exec_time = min_exec_time = max_exec_time = std_exec_time = 0
             
-            # PDC Waiting Time statistics
-            avg_pdc_waiting = df['PDCWaitingTime'].mean()
-            min_pdc_waiting = df['PDCWaitingTime'].min()
-            max_pdc_waiting = df['PDCWaitingTime'].max()
-            std_pdc_waiting = df['PDCWaitingTime'].std()
+            # PDC Waiting Time and Total time statistics (from TotalTime column in CSV) in one agg call
+            time_stats = df.agg({'PDCWaitingTime': ['mean', 'min', 'max', 'std'], 'TotalTime': ['mean', 'min', 'max', 'std']})
+            avg_pdc_waiting, min_pdc_waiting, max_pdc_waiting, std_pdc_waiting = time_stats['PDCWaitingTime']
+            avg_total_time, min_total_time, max_total_time, std_total_time = time_stats['TotalTime']
             
-            # Total time statistics (from TotalTime column in CSV)
-            avg_total_time = df['TotalTime'].mean()
-            min_total_time = df['TotalTime'].min()
-            max_total_time = df['TotalTime'].max()
-            std_total_time = df['TotalTime'].std()
+            # Batch type counts in one pass
+            batch_counts = df['BatchType'].value_counts()
+            complete_batches = int(batch_counts.get('COMPLETE', 0))
+            timeout_batches = int(batch_counts.get('TIMEOUT', 0))
             
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === GRID ANALYSIS TASK STATISTICS ===
 
 GRID ANALYSIS TASK COMPLETION:
@@ -1298,67 +1182,65 @@ TOTAL PROCESSING TIME (All tasks):
 - Standard Deviation: {std_total_time:.4f}s
 
 BATCH INFORMATION:
-- Complete Batches: {len(df[df['BatchType'] == 'COMPLETE'])}
-- Timeout Batches: {len(df[df['BatchType'] == 'TIMEOUT'])}
-- Complete Batch Rate: {(len(df[df['BatchType'] == 'COMPLETE']) / total_tasks) * 100:.2f}%
+- Complete Batches: {complete_batches}
+- Timeout Batches: {timeout_batches}
+- Complete Batch Rate: {(complete_batches / total_tasks) * 100:.2f}%
 - Average PDC Waiting Time: {avg_pdc_waiting:.4f}s
 
-"""
+""")
         except Exception as e:
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === GRID ANALYSIS TASK STATISTICS ===
 ERROR: Could not analyze Grid Analysis tasks: {str(e)}
 
-"""
+""")
+    elif 'state' in csv_paths:
+        report_parts.append(f"""
+=== GRID ANALYSIS TASK STATISTICS ===
+ERROR: Could not parse Grid Analysis CSV file: {csv_paths['state']}
+
+""")
     else:
-        comprehensive_report += f"""
+        report_parts.append(f"""
 === GRID ANALYSIS TASK STATISTICS ===
 WARNING: Grid Analysis CSV file not found
 
-"""
+""")
     
-    # **SECTION 3: Network Infrastructure Layer Statistics**
-    network_csv = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_network_usage.csv") or file == "Sequential_simulation_network_usage.csv":
-            network_csv = os.path.join(simulation_folder, file)
-            break
+    return "".join(report_parts)
+
+def _network_layer_section(csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame]) -> str:
+    """Comprehensive statistics section 3: network infrastructure layer statistics."""
+    report_parts: List[str] = []
+    
+    df_network = dfs.get('network')
     
-    if network_csv and os.path.exists(network_csv):
+    if df_network is not None:
         try:
-            import pandas as pd
-            df_network = pd.read_csv(network_csv)
-            
-            # Initialize data volume counters for each network layer
-            cellular_data = 0.0  # CELLULAR NETWORK (PMU → GNB)
-            gnb_data = 0.0       # GNB NETWORK 
-            telco_data = 0.0     # TELCO NETWORK
-            tso_data = 0.0       # TSO NETWORK
+            # **FILTER: Only include network transport data, not processing data**
+            levels = df_network['NetworkLevel'].fillna('')
+            transport = ~levels.str.startswith('StateEstimation_')
+            
+            # Map network levels to infrastructure layers based on CSV data, first match wins
+            # (individual device data PMU_#, GNB_# goes to its own layer)
+            # Bucket codes: 0 cellular, 1 gnb_telco, 2 tso, 3 gnb, 4 other
+            bucket = np.select(
+                [levels.eq('PMU_to_GNB') | levels.str.startswith('PMU_'),
+                 levels.isin(['GNB_to_TELCO', 'TELCO_to_GNB']),
+                 levels.eq('TSO'),
+                 levels.str.startswith('GNB_')],
+                [0, 1, 2, 3],
+                default=4
+            )
+            # Accumulate the transport volumes per bucket in a single C pass over the codes
+            transport_mask = transport.to_numpy(dtype=bool)
+            volumes = df_network['TotalDataVolumeKB'].fillna(0.0).to_numpy(dtype=np.float64)
+            sums = np.bincount(bucket[transport_mask], weights=volumes[transport_mask], minlength=5)
             
-            # Read actual data volumes from CSV
-            for _, row in df_network.iterrows():
-                level = row['NetworkLevel']
-                volume = row['TotalDataVolumeKB']
-                
-                # **FILTER: Only include network transport data, not processing data**
-                if level.startswith('StateEstimation_'):
-                    continue  # Skip processing data from infrastructure calculations
-                
-                # Map network levels to infrastructure layers based on CSV data
-                if level == 'PMU_to_GNB':
-                    cellular_data += volume
-                elif level in ['GNB_to_TELCO', 'TELCO_to_GNB']:
-                    gnb_data += volume
-                    telco_data += volume  # TELCO handles the same data that passes through it
-                elif level == 'TSO':
-                    tso_data += volume
-                # Look for individual device data (PMU_#, GNB_#, TSO)
-                elif level.startswith('PMU_'):
-                    cellular_data += volume
-                elif level.startswith('GNB_'):
-                    gnb_data += volume
-                elif level == 'TSO':
-                    tso_data += volume
+            cellular_data = float(sums[0])  # CELLULAR NETWORK (PMU → GNB)
+            gnb_data = float(sums[1] + sums[3])  # GNB NETWORK
+            telco_data = float(sums[1])  # TELCO NETWORK handles the same data that passes through it
+            tso_data = float(sums[2])  # TSO NETWORK
             
             # Calculate control data as 3% of data volume for each layer
             cellular_control = cellular_data * 0.03  # 3% control overhead
@@ -1372,7 +1254,7 @@ WARNING: Grid Analysis CSV file not found
             telco_total = telco_data + telco_control
             tso_total = tso_data + tso_control
             
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === NETWORK INFRASTRUCTURE LAYER STATISTICS ===
 
 CELLULAR NETWORK (PMU → GNB):
@@ -1395,41 +1277,73 @@ TSO NETWORK:
 - Control Data Volume: {tso_control:.2f} KB
 - Total Data Volume: {tso_total:.2f} KB
 
-"""
+""")
         except Exception as e:
-            comprehensive_report += f"""
+            report_parts.append(f"""
 === NETWORK INFRASTRUCTURE LAYER STATISTICS ===
 ERROR: Could not analyze network layer statistics: {str(e)}
 
-"""
+""")
+    elif 'network' in csv_paths:
+        report_parts.append(f"""
+=== NETWORK INFRASTRUCTURE LAYER STATISTICS ===
+ERROR: Could not parse Network usage CSV file: {csv_paths['network']}
+
+""")
     else:
-        comprehensive_report += f"""
+        report_parts.append(f"""
 === NETWORK INFRASTRUCTURE LAYER STATISTICS ===
 WARNING: Network usage CSV file not found
 
-"""
+""")
+    
+    return "".join(report_parts)
 
-    comprehensive_report += f"""
+def generate_comprehensive_statistics(simulation_folder: str, csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame], pmu_summary: Optional[PmuTransferSummary], logger: logging.Logger):
+    """Generate comprehensive statistics file combining PMU data and Grid Analysis analysis."""
+    logger.info("Generating Comprehensive Statistics...")
+    
+    # **Read PMU count from simulation parameters**
+    params = read_simulation_parameters()
+    max_pmus = params['max_edge_devices']
+    
+    report_parts: List[str] = [f"""
+=== PMU SMART GRID SIMULATION STATISTICS ===
+Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Simulation Folder: {os.path.basename(simulation_folder)}
+
+PMU CONFIGURATION:
+- Total PMUs: {max_pmus}
+- Simulation Area: {params['length']}m x {params['width']}m
+- Edge Coverage: {params['edge_datacenters_coverage']}m
+
+"""]
+    
+    report_parts.append(_pmu_transfer_section(simulation_folder, csv_paths, dfs, pmu_summary))  # SECTION 1: PMU Data Transfer Analysis
+    report_parts.append(_grid_analysis_section(csv_paths, dfs))  # SECTION 2: Grid Analysis
+    report_parts.append(_network_layer_section(csv_paths, dfs))  # SECTION 3: Network Infrastructure Layer Statistics
+    
+    report_parts.append(f"""
 ========================================
 Analysis completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ========================================
-"""
+""")
+    
+    comprehensive_report = "".join(report_parts)
     
     # **Save single comprehensive statistics file**
     stats_file = os.path.join(simulation_folder, "simulation_statistics.txt")
-    with open(stats_file, 'w') as f:
+    with open(stats_file, 'w', encoding='utf-8', buffering=1 << 20) as f:  # One write of the whole report
         f.write(comprehensive_report)
     
     # Log to console and file
     # logger.info(comprehensive_report)  # REMOVED - no file logging
-    print(comprehensive_report)
-    
     # logger.info(f"Comprehensive statistics saved to: {stats_file}")  # REMOVED
-    print(f"📊 Comprehensive statistics saved to: {stats_file}")
+    print(f"{comprehensive_report}\n📊 Comprehensive statistics saved to: {stats_file}")
     
     return stats_file
 
-def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
+def export_statistics_to_csv(simulation_folder: str, csv_paths: Dict[str, str], dfs: Dict[str, pd.DataFrame], pmu_summary: Optional[PmuTransferSummary], logger: logging.Logger):
     """Export comprehensive statistics to simple CSV format for easier analysis."""
     logger.info("Exporting statistics to CSV format...")
     
@@ -1439,11 +1353,9 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     
     # **Get data for CSV export**
     try:
-        _, hop_averages = read_pmu_positions_from_csv(simulation_folder)
-        pmu_to_gnb_avg_times = calculate_pmu_to_gnb_average_times(simulation_folder)
+        _, hop_stats, _, _ = read_pmu_positions_from_csv(simulation_folder)
     except Exception as e:
-        hop_averages = {}
-        pmu_to_gnb_avg_times = {}
+        hop_stats = HopStats.empty()
         print(f"Could not get hop averages for CSV export: {e}")
     
     # **Create simple CSV data structure - Just Metric and Value**
@@ -1453,35 +1365,29 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     csv_data.append(['=== PMU DATA TRANSFER STATISTICS ===', ''])
     
     # **1. Total Data Volume**
-    pmu_csv = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_pmu_data_transfers.csv") or file == "Sequential_simulation_pmu_data_transfers.csv":
-            pmu_csv = os.path.join(simulation_folder, file)
-            break
-    
-    if pmu_csv and os.path.exists(pmu_csv):
+    if pmu_summary is not None:
         try:
-            import pandas as pd
-            df = pd.read_csv(pmu_csv)
-            total_data_volume = df['DataSize'].sum()
+            total_data_volume = pmu_summary.data_size_sum
             csv_data.append(['Total Data Volume', f'{total_data_volume:.2f} KB'])
             
         except Exception as e:
             csv_data.append(['Total Data Volume', 'ERROR'])
+    elif 'pmu' in csv_paths:
+        csv_data.append(['Total Data Volume', 'ERROR'])  # The transfers CSV could not be parsed
     
     csv_data.append(['', ''])  # Empty row for separation
     
     # **2. AVERAGE HOP DELAY AND DISTANCE (PMU → GNB)**
     csv_data.append(['=== AVERAGE HOP DELAY AND DISTANCE (PMU → GNB) ===', ''])
     
-    if hop_averages:
+    if hop_stats:
         # Only PMU->GNB hop exists in distributed architecture
-        pmu_to_gnb_times = [avg['gnb'] for avg in hop_averages.values() if avg['gnb'] > 0]
-        pmu_to_gnb_distances = [avg['gnb_distance'] for avg in hop_averages.values() if avg['gnb_distance'] > 0]
+        pmu_to_gnb_times = hop_stats.gnb_time[hop_stats.gnb_time > 0]
+        pmu_to_gnb_distances = hop_stats.gnb_distance[hop_stats.gnb_distance > 0]
         
-        if pmu_to_gnb_times:
-            avg_pmu_to_gnb = sum(pmu_to_gnb_times) / len(pmu_to_gnb_times)
-            avg_pmu_to_gnb_dist = sum(pmu_to_gnb_distances) / len(pmu_to_gnb_distances) if pmu_to_gnb_distances else 0
+        if pmu_to_gnb_times.size:
+            avg_pmu_to_gnb = pmu_to_gnb_times.mean()
+            avg_pmu_to_gnb_dist = pmu_to_gnb_distances.mean() if pmu_to_gnb_distances.size else 0
             
             csv_data.append(['Average Hop Delay', f'{avg_pmu_to_gnb:.4f}s'])
             csv_data.append(['Average Distance', f'{avg_pmu_to_gnb_dist:.1f}m'])
@@ -1492,11 +1398,11 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     # **3. PMU DATA MISSED DEADLINE SUMMARY**
     csv_data.append(['=== PMU DATA MISSED DEADLINE SUMMARY ===', ''])
     
-    if hop_averages:
-        total_deadline_missed = sum(avg.get('deadline_missed', 0) for avg in hop_averages.values())
-        total_all_transfers = sum(avg.get('total_transfers', 0) for avg in hop_averages.values())
+    if hop_stats:
+        total_deadline_missed = int(hop_stats.deadline_missed.sum())
+        total_all_transfers = int(hop_stats.total_transfers.sum())
         overall_deadline_missed_rate = (total_deadline_missed / total_all_transfers) * 100 if total_all_transfers > 0 else 0
-        pmus_with_misses = len([avg for avg in hop_averages.values() if avg.get('deadline_missed', 0) > 0])
+        pmus_with_misses = int(np.count_nonzero(hop_stats.deadline_missed))
         
         csv_data.append(['PMU Data that Missed Deadline', f'{total_deadline_missed}/{total_all_transfers} ({overall_deadline_missed_rate:.2f}%)'])
     
@@ -1508,86 +1414,48 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     # **Read PDC Waiting Times and Total Times from state estimation CSV for CSV export**
     gnb_pdc_waiting_times_csv = {}
     gnb_total_times_csv = {}
-    state_csv_export = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_state_estimation.csv") or file == "Sequential_simulation_state_estimation.csv":
-            state_csv_export = os.path.join(simulation_folder, file)
-            break
+    df_state_export = dfs.get('state')
     
-    if state_csv_export and os.path.exists(state_csv_export):
-        import pandas as pd
-        df_state_export = pd.read_csv(state_csv_export)
+    if df_state_export is not None:
         
-        # Group by GNBID and calculate average PDCWaitingTime and TotalTime
-        for gnb_id in df_state_export['GNBID'].unique():
-            gnb_rows = df_state_export[df_state_export['GNBID'] == gnb_id]
-            avg_pdc_waiting = gnb_rows['PDCWaitingTime'].mean() if 'PDCWaitingTime' in gnb_rows.columns else 0.0
-            avg_total_time = gnb_rows['TotalTime'].mean() if 'TotalTime' in gnb_rows.columns else 0.0
-            gnb_name = f"GNB_{gnb_id}"
-            gnb_pdc_waiting_times_csv[gnb_name] = avg_pdc_waiting
-            gnb_total_times_csv[gnb_name] = avg_total_time
+        # Average PDCWaitingTime and TotalTime per GNBID in one groupby pass (a missing column averages 0.0)
+        state_columns = ['PDCWaitingTime', 'TotalTime']
+        state_means = df_state_export.groupby('GNBID')[[c for c in state_columns if c in df_state_export.columns]].mean()
+        state_means = state_means.reindex(columns=state_columns, fill_value=0.0)
+        gnb_pdc_waiting_times_csv = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['PDCWaitingTime'].items()}
+        gnb_total_times_csv = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['TotalTime'].items()}
     
     # **Calculate average transfer delay per PMU from HopSum for CSV export**
     pmu_avg_transfer_delay_csv = {}
     
-    # **Re-analyze CSV for accurate OK/total counts in CSV export**
-    if pmu_csv and os.path.exists(pmu_csv):
-        import pandas as pd
-        df_csv = pd.read_csv(pmu_csv)
-        
-        pmu_csv_stats = {}
-        gnb_csv_stats = {}
-        
-        # Group by PMU ID to get stats per PMU
-        for pmu_id in sorted(df_csv['PmuID'].unique()):
-            pmu_rows = df_csv[df_csv['PmuID'] == pmu_id]
-            total_transfers = len(pmu_rows)
-            ok_transfers = len(pmu_rows[pmu_rows['Status'] == 'S'])
-            deadline_missed_transfers = len(pmu_rows[pmu_rows['Status'] == 'L'])
-            
-
-            
-            # Extract GNB name from path
-            gnb_name = 'GNB_Unknown'
-            if not pmu_rows.empty and 'Path' in pmu_rows.columns:
-                sample_path = pmu_rows.iloc[0]['Path']
-                if ' -> ' in sample_path:
-                    parts = sample_path.split(' -> ')
-                    if len(parts) >= 2:
-                        gnb_part = parts[1].strip()
-                        import re
-                        gnb_match = re.match(r'(GNB_\d+)', gnb_part)
-                        if gnb_match:
-                            gnb_name = gnb_match.group(1)
-            
-            pmu_csv_stats[pmu_id] = {
-                'ok_count': ok_transfers,
-                'total_count': total_transfers,
-                'gnb_name': gnb_name
-            }
-            
-            # **Calculate average transfer delay for this PMU from HopSum for CSV export**
-            avg_hop_sum_csv = pmu_rows['HopSum'].mean() if 'HopSum' in pmu_rows.columns else 0.0
-            pmu_avg_transfer_delay_csv[pmu_id] = avg_hop_sum_csv
-            
-            # Accumulate stats per GNB
-            if gnb_name not in gnb_csv_stats:
-                gnb_csv_stats[gnb_name] = {'ok_count': 0, 'total_count': 0, 'pmu_count': 0}
-            gnb_csv_stats[gnb_name]['ok_count'] += ok_transfers
-            gnb_csv_stats[gnb_name]['total_count'] += total_transfers
-            gnb_csv_stats[gnb_name]['pmu_count'] += 1
-        
-        # Add PMU details to CSV
-        for pmu_id in sorted(pmu_csv_stats.keys()):
-            stats = pmu_csv_stats[pmu_id]
-            ok_count = stats['ok_count']
-            total_count = stats['total_count']
-            gnb_name = stats['gnb_name']
-            success_rate = (ok_count / total_count) * 100 if total_count > 0 else 0
-            avg_transfer_delay_csv = pmu_avg_transfer_delay_csv.get(pmu_id, 0.0)
-            
-            pmu_detail = f'{ok_count}/{total_count} transfers on time ({success_rate:.1f}%) - avg transfer delay: {avg_transfer_delay_csv:.4f}s'
-            csv_data.append([f'PMU_{pmu_id:02d} → {gnb_name}', pmu_detail])
+    # **Accurate OK/total counts per PMU from the loader's PmuTransferSummary for CSV export**
+    if pmu_summary is not None:
+        pmu_stats_frame = pmu_summary.per_pmu
+        pmu_csv_stats = pmu_stats_frame[['ok_count', 'total_count', 'gnb_name']].to_dict('index')
+        
+        # **Average transfer delay for each PMU from HopSum for CSV export**
+        avg_hop_sums_csv = pmu_stats_frame['avg_transfer_delay']
+        pmu_avg_transfer_delay_csv = avg_hop_sums_csv.to_dict()
+        
+        # Accumulate stats per GNB
+        gnb_csv_stats = pmu_stats_frame.groupby('gnb_name').agg(
+            ok_count=('ok_count', 'sum'),
+            total_count=('total_count', 'sum'),
+            pmu_count=('ok_count', 'size')
+        ).to_dict('index')
+        
+        # Add PMU details to CSV (none for an empty table, see the statistics report)
+        if not pmu_stats_frame.empty:
+            ok_counts = pmu_stats_frame['ok_count']
+            total_counts = pmu_stats_frame['total_count']
+            success_rates = (ok_counts / total_counts * 100).where(total_counts > 0, 0)
+            pmu_labels = "PMU_" + pmu_stats_frame.index.to_series().astype(str).str.zfill(2) + " → " + pmu_stats_frame['gnb_name']
+            pmu_details = (
+                ok_counts.astype(str) + "/" + total_counts.astype(str)
+                + " transfers on time (" + success_rates.map('{:.1f}'.format)
+                + "%) - avg transfer delay: " + avg_hop_sums_csv.map('{:.4f}'.format) + "s"
+            )
+            csv_data.extend([label, detail] for label, detail in zip(pmu_labels, pmu_details))
     
     csv_data.append(['', ''])  # Empty row
     
@@ -1612,20 +1480,15 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     csv_data.append(['=== GRID ANALYSIS TASK STATISTICS ===', ''])
     
     # **6. GRID ANALYSIS TASK COMPLETION**
-    state_csv = None
-    for file in os.listdir(simulation_folder):
-        if file.endswith("_state_estimation.csv") or file == "Sequential_simulation_state_estimation.csv":
-            state_csv = os.path.join(simulation_folder, file)
-            break
+    df = dfs.get('state')
     
-    if state_csv and os.path.exists(state_csv):
+    if df is not None:
         try:
-            import pandas as pd
-            df = pd.read_csv(state_csv)
             
             total_tasks = len(df)
-            successful_tasks = len(df[df['SuccessFlag'] == 1])
-            failed_tasks = len(df[df['SuccessFlag'] == 0])
+            successful_df = df[df['SuccessFlag'] == 1]
+            successful_tasks = len(successful_df)
+            failed_tasks = int((df['SuccessFlag'] == 0).sum())
             success_rate = (successful_tasks / total_tasks) * 100 if total_tasks > 0 else 0
             
             csv_data.append(['Total Tasks', total_tasks])
@@ -1637,7 +1500,6 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
             
             # **7. EXECUTION TIME (Successful tasks only)**
             csv_data.append(['=== EXECUTION TIME (Successful tasks only) ===', ''])
-            successful_df = df[df['SuccessFlag'] == 1]
             if len(successful_df) > 0:
                 csv_data.append(['Average Execution Time', f"{successful_df['ExecTime'].mean():.4f}s"])
                 csv_data.append(['Minimum Execution Time', f"{successful_df['ExecTime'].min():.4f}s"])
@@ -1654,8 +1516,10 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
             
             # **9. BATCH INFORMATION**
             csv_data.append(['=== BATCH INFORMATION ===', ''])
-            complete_batches = len(df[df['BatchType'] == 'COMPLETE'])
-            timeout_batches = len(df[df['BatchType'] == 'TIMEOUT'])
+            # Batch type counts in one pass over the categorical codes
+            batch_counts = df['BatchType'].value_counts()
+            complete_batches = int(batch_counts.get('COMPLETE', 0))
+            timeout_batches = int(batch_counts.get('TIMEOUT', 0))
             complete_batch_rate = (complete_batches / total_tasks) * 100 if total_tasks > 0 else 0
             avg_pdc_waiting = df['PDCWaitingTime'].mean()
             
@@ -1672,15 +1536,8 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
     # **Write simple CSV file**
     csv_file = os.path.join(simulation_folder, "simulation_analysis.csv")
     try:
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            csv_writer = csv.writer(f)
-            
-            # Write header
-            csv_writer.writerow(['Metric', 'Value'])
-            
-            # Write data
-            for row in csv_data:
-                csv_writer.writerow(row)
+        # One buffered write; '\r\n' line endings as csv.writer produced them
+        pd.DataFrame(csv_data, columns=['Metric', 'Value']).to_csv(csv_file, index=False, encoding='utf-8', lineterminator='\r\n')
         
         print(f"📊 Statistics exported to CSV: {csv_file}")
         logger.info(f"Statistics exported to CSV: {csv_file}")
@@ -1689,6 +1546,7 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
         if 'pmu_csv_stats' in locals() and 'pmu_avg_transfer_delay_csv' in locals() and 'gnb_csv_stats' in locals() and 'gnb_pdc_waiting_times_csv' in locals():
             create_performance_charts(
                 simulation_folder=simulation_folder,
+                df_state=dfs.get('state'),
                 pmu_stats=pmu_csv_stats,
                 pmu_delays=pmu_avg_transfer_delay_csv,
                 gnb_stats=gnb_csv_stats,
@@ -1703,7 +1561,7 @@ def export_statistics_to_csv(simulation_folder: str, logger: logging.Logger):
         logger.error(f"Error writing CSV file: {e}")
         return None
 
-def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delays: dict, gnb_stats: dict, gnb_waiting_times: dict, logger: logging.Logger):
+def create_performance_charts(simulation_folder: str, df_state: Optional[pd.DataFrame], pmu_stats: dict, pmu_delays: dict, gnb_stats: dict, gnb_waiting_times: dict, logger: logging.Logger):
     """Create 4 performance bar charts: PMU success rates, PMU delays, GNB success rates, GNB waiting times."""
     logger.info("Creating performance charts...")
     
@@ -1712,17 +1570,15 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('PMU Smart Grid Performance Analysis', fontsize=16, fontweight='bold')
         
+        # **PMU IDs sorted once and shared by the two PMU charts**
+        pmu_ids = sorted(pmu_stats or pmu_delays)
+        pmu_labels = [f'{pmu_id:02d}' for pmu_id in pmu_ids]
+        
         # Chart 1: PMU Success Rates (top left)
         if pmu_stats:
-            pmu_ids = sorted(pmu_stats.keys())
-            pmu_success_rates = []
-            pmu_labels = []
-            
-            for pmu_id in pmu_ids:
-                stats = pmu_stats[pmu_id]
-                success_rate = (stats['ok_count'] / stats['total_count']) * 100 if stats['total_count'] > 0 else 0
-                pmu_success_rates.append(success_rate)
-                pmu_labels.append(f'{pmu_id:02d}')
+            ok_counts = np.fromiter((pmu_stats[pmu_id]['ok_count'] for pmu_id in pmu_ids), dtype=np.float64, count=len(pmu_ids))
+            total_counts = np.fromiter((pmu_stats[pmu_id]['total_count'] for pmu_id in pmu_ids), dtype=np.float64, count=len(pmu_ids))
+            pmu_success_rates = np.divide(ok_counts, total_counts, out=np.zeros(len(pmu_ids)), where=total_counts > 0) * 100
             
             bars1 = ax1.bar(pmu_labels, pmu_success_rates, color='green')
             ax1.set_title('PMU Transfer Success Rate', fontweight='bold')
@@ -1732,10 +1588,7 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
             ax1.grid(True, alpha=0.3)
             
             # Add value labels on bars
-            for bar, rate in zip(bars1, pmu_success_rates):
-                height = bar.get_height()
-                ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                        f'{rate:.1f}%', ha='center', va='bottom', fontsize=8)
+            ax1.bar_label(bars1, labels=[f'{rate:.1f}%' for rate in pmu_success_rates], padding=1, fontsize=8)
             
             # Rotate x-axis labels if too many PMUs
             if len(pmu_ids) > 10:
@@ -1743,30 +1596,19 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
         
         # Chart 2: PMU Average Transfer Delays (top right)  
         if pmu_delays:
-            pmu_ids_delay = sorted(pmu_delays.keys())
-            pmu_delay_values = []
-            pmu_delay_labels = []
-            
-            for pmu_id in pmu_ids_delay:
-                delay = pmu_delays[pmu_id]
-                pmu_delay_values.append(delay)
-                pmu_delay_labels.append(f'{pmu_id:02d}')
+            pmu_delay_values = np.fromiter((pmu_delays.get(pmu_id, 0.0) for pmu_id in pmu_ids), dtype=np.float64, count=len(pmu_ids))
             
-            bars2 = ax2.bar(pmu_delay_labels, pmu_delay_values, color='blue')
+            bars2 = ax2.bar(pmu_labels, pmu_delay_values, color='blue')
             ax2.set_title('PMU Average Transfer Delay', fontweight='bold')
             ax2.set_xlabel('PMU ID')
             ax2.set_ylabel('Average Transfer Delay (ms)')
             ax2.grid(True, alpha=0.3)
             
             # Add value labels on bars (convert to ms)
-            for bar, delay in zip(bars2, pmu_delay_values):
-                height = bar.get_height()
-                delay_ms = delay * 1000  # Convert to milliseconds
-                ax2.text(bar.get_x() + bar.get_width()/2., height + height*0.02,
-                        f'{delay_ms:.0f}ms', ha='center', va='bottom', fontsize=8)
+            ax2.bar_label(bars2, labels=[f'{delay * 1000:.0f}ms' for delay in pmu_delay_values], padding=1, fontsize=8)
             
             # Rotate x-axis labels if too many PMUs
-            if len(pmu_ids_delay) > 10:
+            if len(pmu_ids) > 10:
                 ax2.tick_params(axis='x', rotation=45)
         
         # Chart 3: GNB Success Rates (bottom left)
@@ -1787,35 +1629,21 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
             ax3.grid(True, alpha=0.3)
             
             # Add value labels on bars
-            for bar, rate in zip(bars3, gnb_success_rates):
-                height = bar.get_height()
-                ax3.text(bar.get_x() + bar.get_width()/2., height + 1,
-                        f'{rate:.1f}%', ha='center', va='bottom', fontsize=10)
+            ax3.bar_label(bars3, labels=[f'{rate:.1f}%' for rate in gnb_success_rates], padding=1, fontsize=10)
         
         # Chart 4: GNB Average Timings (bottom right) - Stacked bar chart
         if gnb_waiting_times:
-            # Read state estimation CSV to get execution times per GNB
-            state_csv = None
-            for file in os.listdir(simulation_folder):
-                if file.endswith("_state_estimation.csv") or file == "Sequential_simulation_state_estimation.csv":
-                    state_csv = os.path.join(simulation_folder, file)
-                    break
-            
+            # Use the state estimation data to get execution times per GNB
             gnb_exec_times = {}
             gnb_total_times_chart = {}
             
-            if state_csv and os.path.exists(state_csv):
-                import pandas as pd
-                df_state = pd.read_csv(state_csv)
-                
-                # Calculate average execution times and total times per GNB
-                for gnb_id in df_state['GNBID'].unique():
-                    gnb_rows = df_state[df_state['GNBID'] == gnb_id]
-                    avg_exec_time = gnb_rows['ExecTime'].mean() if 'ExecTime' in gnb_rows.columns else 0.0
-                    avg_total_time = gnb_rows['TotalTime'].mean() if 'TotalTime' in gnb_rows.columns else 0.0
-                    gnb_name = f"GNB_{gnb_id}"
-                    gnb_exec_times[gnb_name] = avg_exec_time
-                    gnb_total_times_chart[gnb_name] = avg_total_time
+            if df_state is not None:
+                # Average ExecTime and TotalTime per GNBID in one groupby pass (a missing column averages 0.0)
+                state_columns = ['ExecTime', 'TotalTime']
+                state_means = df_state.groupby('GNBID')[[c for c in state_columns if c in df_state.columns]].mean()
+                state_means = state_means.reindex(columns=state_columns, fill_value=0.0)
+                gnb_exec_times = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['ExecTime'].items()}
+                gnb_total_times_chart = {f"GNB_{gnb_id}": t for gnb_id, t in state_means['TotalTime'].items()}
             
             gnb_names_wait = sorted(gnb_waiting_times.keys())
             gnb_pdc_times = []
@@ -1837,11 +1665,16 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
             # Create stacked bar chart (Network Time → PDC Waiting Time → Execution Time → Return Network Time)
             bars4_network = ax4.bar(gnb_names_wait, gnb_network_times, color='blue', label='Network Time', width=0.6)
             bars4_pdc = ax4.bar(gnb_names_wait, gnb_pdc_times, bottom=gnb_network_times, color='lightcoral', label='PDC Waiting Time', width=0.6)
+            # Running tops of the stack, built once as arrays
+            network_top = np.asarray(gnb_network_times, dtype=float)
+            pdc_top = network_top + np.asarray(gnb_pdc_times, dtype=float)
+            exec_top = pdc_top + np.asarray(gnb_exec_times_list, dtype=float)
+            total_times = exec_top + np.asarray(gnb_return_network_times, dtype=float)
             bars4_exec = ax4.bar(gnb_names_wait, gnb_exec_times_list, 
-                               bottom=[n + p for n, p in zip(gnb_network_times, gnb_pdc_times)], 
+                               bottom=pdc_top, 
                                color='orange', label='Execution Time', width=0.6)
             bars4_return = ax4.bar(gnb_names_wait, gnb_return_network_times, 
-                                  bottom=[n + p + e for n, p, e in zip(gnb_network_times, gnb_pdc_times, gnb_exec_times_list)], 
+                                  bottom=exec_top, 
                                   color='lightblue', label='Return Network Time', width=0.6)
             
             ax4.set_title('GNB Average Timings', fontweight='bold')
@@ -1854,12 +1687,8 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
             ax4.set_ylim(0, 0.25)
             
             # Add total time labels on top of bars (convert to ms)
-            for i, gnb_name in enumerate(gnb_names_wait):
-                total_time = gnb_network_times[i] + gnb_pdc_times[i] + gnb_exec_times_list[i] + gnb_return_network_times[i]
-                if total_time > 0:
-                    total_time_ms = total_time * 1000  # Convert to milliseconds
-                    ax4.text(i, total_time + total_time*0.02,
-                            f'{total_time_ms:.0f}ms', ha='center', va='bottom', fontsize=9, fontweight='bold')
+            ax4.bar_label(bars4_return, labels=[f'{total_time * 1000:.0f}ms' if total_time > 0 else '' for total_time in total_times],
+                          padding=2, fontsize=9, fontweight='bold')
         
         # Adjust layout to prevent overlap
         plt.tight_layout()
@@ -1867,7 +1696,7 @@ def create_performance_charts(simulation_folder: str, pmu_stats: dict, pmu_delay
         
         # Save the chart
         chart_file = os.path.join(simulation_folder, "performance_analysis_charts.png")
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+        plt.savefig(chart_file, dpi=150, bbox_inches='tight')  # Bar charts stay legible at 150 DPI
         plt.close()
         
         print(f"📊 Performance charts saved to: {chart_file}")
@@ -1884,13 +1713,18 @@ def main():
     """Main entry point for the PMU analysis script."""
     parser = argparse.ArgumentParser(description='Analyze PMU Smart Grid simulation data')
     parser.add_argument('output_folder', help='The output folder containing the simulation data')
+    parser.add_argument('--force', action='store_true',
+                        help='Redraw the map and network charts even if they are newer than their inputs')
     args = parser.parse_args()
     
     print(f"=== PMU Log Analysis Starting ===")
     print(f"Output folder: {args.output_folder}")
     
     # Run the analysis
-    analyze_pmu_simulation(args.output_folder)
+    try:
+        analyze_pmu_simulation(args.output_folder, force=args.force)
+    finally:
+        dispose_figs()
     
     print(f"=== PMU Log Analysis Complete ===")
 